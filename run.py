@@ -2,6 +2,7 @@
 Main entry point for the Agentic Facebook Performance Analyst.
 """
 
+import argparse
 import sys
 import os
 from pathlib import Path
@@ -14,9 +15,14 @@ from src.orchestrator.runner import AgentOrchestrator
 
 def main():
     """Main execution function."""
+    parser = argparse.ArgumentParser(description="Agentic Facebook Performance Analyst")
+    parser.add_argument("query", nargs="*", help="Question about ad performance")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the LLM response cache")
+    args = parser.parse_args()
+
     # Get query from command line or use default
-    if len(sys.argv) > 1:
-        query = " ".join(sys.argv[1:])
+    if args.query:
+        query = " ".join(args.query)
     else:
         query = "Analyze why ROAS has declined over the past 30 days and recommend new creative strategies"
 
@@ -30,7 +36,7 @@ def main():
     print(f"📋 Query: {query}\n")
 
     # Initialize and run orchestrator
-    orchestrator = AgentOrchestrator("config/config.yaml")
+    orchestrator = AgentOrchestrator("config/config.yaml", use_cache=not args.no_cache)
     result = orchestrator.execute(query)
 
     if result.get("status") == "success":
@@ -2,7 +2,7 @@
 Agents module for the Agentic Facebook Analyst.
 """
 
-from .base import BaseAgent, LLMClient
+from .base import BaseAgent, LLMClient, run_sync
 from .planner import PlannerAgent
 from .data_agent import DataAgent
 from .insight_agent import InsightAgent
@@ -17,4 +17,5 @@ __all__ = [
     'InsightAgent',
     'EvaluatorAgent',
     'CreativeGeneratorAgent',
+    'run_sync',
 ]
@@ -3,102 +3,619 @@ Base agent class and LLM client wrapper for the Agentic Facebook Analyst.
 """
 import os
 import json
-from typing import Dict, Any, Optional, List
+import asyncio
+import time
+import threading
+import re
+import functools
+from pathlib import Path
+from collections import deque
+from typing import Any, Coroutine, Deque, Dict, Optional, List, Tuple, TypeVar
 from abc import ABC, abstractmethod
 import google.generativeai as genai
-from datetime import datetime
+from google.generativeai import caching
+from datetime import datetime, timedelta
+from src.utils.llm_cache import LLMCache
+from src.utils.logging import get_logger
+from src.utils.serialization import json_loads
+
+
+T = TypeVar("T")
+
+# API key genai was last configured with; guards against re-configuring the SDK
+_configured_api_key: Optional[str] = None
+
+_JSON_FENCE = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.S)
+
+
+# Relative prompt paths resolve here, so agents work from any working directory
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+@functools.lru_cache(maxsize=None)
+def load_prompt(path: str) -> str:
+    """Read a prompt template, caching its contents for the process lifetime."""
+    prompt_path = Path(path)
+    if not prompt_path.is_absolute():
+        prompt_path = _REPO_ROOT / prompt_path
+    return prompt_path.read_text()
+
+
+# grpc.aio channels belong to the event loop that created them, and the SDK
+# keeps one async client per process. Synchronous entry points therefore run
+# their coroutines on this one long-lived loop instead of a fresh asyncio.run
+# loop each time, which would leave the shared client bound to a closed loop.
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+_event_loop_lock = threading.Lock()
+
+
+def _shared_event_loop() -> asyncio.AbstractEventLoop:
+    """Return the process-wide event loop, starting its thread on first use."""
+    global _event_loop
+    with _event_loop_lock:
+        if _event_loop is None:
+            _event_loop = asyncio.new_event_loop()
+            threading.Thread(target=_event_loop.run_forever, name="llm-event-loop", daemon=True).start()
+        return _event_loop
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion on the shared event loop and return its result."""
+    loop = _shared_event_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_sync cannot be called from the shared event loop; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+def _chunk_text(chunk: Any) -> str:
+    """Return the text of a streamed response chunk, or '' if it carries none."""
+    try:
+        return chunk.text
+    except ValueError:
+        return ""
+
+
+# Text allowed before a JSON value on its line: nothing, or a code fence opener
+_JSON_LINE_PREFIXES = frozenset({"", "```", "```json"})
+
+
+class _JSONStreamScanner:
+    """
+    Detect the end of the first top-level JSON value in streamed text.
+
+    A value only counts if it opens at the start of a line or right after a
+    code fence, so brackets inside prose are skipped, and it only completes
+    once the captured text actually parses. Otherwise scanning continues and
+    the caller falls back to the full response.
+    """
+
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+        self._line_start = 0
+        self._start: Optional[int] = None
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self.complete = False
+        self.result = ""
+
+    def feed(self, chunk: str) -> bool:
+        """Consume a chunk; return True once a complete value has been seen."""
+        self._text += chunk
+        text = self._text
+        while self._pos < len(text) and not self.complete:
+            char = text[self._pos]
+            if self._start is None:
+                if char == "\n":
+                    self._line_start = self._pos + 1
+                elif char in "{[" and text[self._line_start:self._pos].strip() in _JSON_LINE_PREFIXES:
+                    self._start = self._pos
+                    self._depth = 1
+            elif self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._finish_value(text[self._start:self._pos + 1])
+            self._pos += 1
+        return self.complete
+
+    def _finish_value(self, candidate: str):
+        """Accept a balanced candidate if it parses, else resume scanning after it."""
+        try:
+            json_loads(candidate)
+        except ValueError:
+            self._start = None
+            self._line_start = self._pos + 1
+            return
+        self.complete = True
+        self.result = candidate
+
+
+class _StreamCollector:
+    """Accumulate streamed response text, optionally stopping at the first JSON value."""
+
+    def __init__(self, stop_at_json: bool = False):
+        self._chunks: List[str] = []
+        self._scanner = _JSONStreamScanner() if stop_at_json else None
+
+    def add(self, chunk: Any) -> bool:
+        """Consume a response chunk; return True once reading can stop."""
+        chunk_text = _chunk_text(chunk)
+        self._chunks.append(chunk_text)
+        return self._scanner is not None and self._scanner.feed(chunk_text)
+
+    def text(self) -> str:
+        """Return the first complete JSON value if one was seen, else the full text."""
+        if self._scanner is not None and self._scanner.complete:
+            text = self._scanner.result
+        else:
+            text = "".join(self._chunks)
+        if not text:
+            raise RuntimeError("LLM generation failed: empty response")
+        return text
 
 
 class LLMClient:
     """Wrapper for Google Generative AI client."""
 
+    _instances: Dict[Tuple[Optional[str], str], "LLMClient"] = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def get(cls, api_key: Optional[str] = None, model_name: str = "gemini-2.0-flash") -> "LLMClient":
+        """Return the shared client for (api_key, model_name), creating it on first use."""
+        key = (api_key or os.getenv("GOOGLE_API_KEY"), model_name)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(api_key=api_key, model_name=model_name)
+            return cls._instances[key]
+
     def __init__(self, api_key: Optional[str] = None, model_name: str = "gemini-2.0-flash"):
-        """Initialize LLM client."""
+        """
+        Initialize LLM client.
+
+        The client is shared by every agent (see get), so it holds no response
+        cache policy; callers pass their LLMCache per request instead.
+        """
         self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
         if not self.api_key:
             raise ValueError("GOOGLE_API_KEY environment variable not set")
         
-        genai.configure(api_key=self.api_key)
+        # genai.configure resets the SDK's cached clients, so only call it when
+        # the key actually changes. Those cached clients (one sync, one async)
+        # are shared by every GenerativeModel, so all agents reuse one channel.
+        # No transport is pinned: the SDK builds the sync client on grpc and
+        # the async one on grpc_asyncio, which generate_content_async needs.
+        global _configured_api_key
+        if _configured_api_key != self.api_key:
+            genai.configure(api_key=self.api_key)
+            _configured_api_key = self.api_key
+
         self.model_name = model_name
         self.model = genai.GenerativeModel(model_name)
+        self._prefix_models: Dict[str, genai.GenerativeModel] = {}
+        self._prefix_models_lock = threading.Lock()
 
     def generate(
         self,
         prompt: str,
         temperature: float = 0.7,
         max_tokens: int = 2048,
+        model: Optional[genai.GenerativeModel] = None,
+        use_cache: bool = True,
+        stop_at_json: bool = False,
+        system_instruction: Optional[str] = None,
+        cache: Optional[LLMCache] = None,
+    ) -> str:
+        """
+        Generate response from LLM, streaming chunks as they arrive.
+
+        With stop_at_json, the stream is abandoned as soon as the first
+        complete top-level JSON value has been received, and only that value
+        is returned. system_instruction carries the static part of the prompt
+        so that it forms a stable, cacheable prefix across calls. Responses
+        are read from and stored in cache when one is given.
+        """
+        key, cached = self._cache_lookup(
+            cache, use_cache, model, prompt, system_instruction, temperature, max_tokens, stop_at_json
+        )
+        if cached is not None:
+            return cached
+
+        model = model or self._model_for(system_instruction)
+        collector = _StreamCollector(stop_at_json)
+        try:
+            response = model.generate_content(
+                prompt,
+                generation_config=self._generation_config(temperature, max_tokens),
+                stream=True,
+            )
+            for chunk in response:
+                if collector.add(chunk):
+                    break
+        except Exception as e:
+            raise RuntimeError(f"LLM generation failed: {str(e)}")
+
+        text = collector.text()
+        self._cache_store(cache, key, text)
+        return text
+
+    async def agenerate(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        model: Optional[genai.GenerativeModel] = None,
+        use_cache: bool = True,
+        stop_at_json: bool = False,
+        system_instruction: Optional[str] = None,
+        cache: Optional[LLMCache] = None,
     ) -> str:
-        """Generate response from LLM."""
+        """Generate response from LLM without blocking the event loop (see generate)."""
+        # Cache reads and writes are file I/O; keep them off the event loop
+        key, cached = await asyncio.to_thread(
+            self._cache_lookup,
+            cache, use_cache, model, prompt, system_instruction, temperature, max_tokens, stop_at_json,
+        )
+        if cached is not None:
+            return cached
+
+        model = model or self._model_for(system_instruction)
+        collector = _StreamCollector(stop_at_json)
         try:
-            response = self.model.generate_content(
+            response = await model.generate_content_async(
                 prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=temperature,
-                    max_output_tokens=max_tokens,
-                ),
+                generation_config=self._generation_config(temperature, max_tokens),
+                stream=True,
             )
-            return response.text
+            async for chunk in response:
+                if collector.add(chunk):
+                    break
         except Exception as e:
             raise RuntimeError(f"LLM generation failed: {str(e)}")
 
+        text = collector.text()
+        await asyncio.to_thread(self._cache_store, cache, key, text)
+        return text
+
     def generate_json(
         self,
         prompt: str,
         temperature: float = 0.7,
         max_tokens: int = 2048,
+        model: Optional[genai.GenerativeModel] = None,
+        use_cache: bool = True,
+        system_instruction: Optional[str] = None,
+        cache: Optional[LLMCache] = None,
     ) -> Dict[str, Any]:
-        """Generate JSON response from LLM."""
-        response = self.generate(prompt, temperature, max_tokens)
-        
-        # Extract JSON from response
+        """
+        Generate JSON response from LLM.
+
+        The response is cached only once it has parsed, so a malformed reply
+        is retried on the next call rather than replayed for the cache TTL.
+        """
+        key, cached = self._cache_lookup(
+            cache, use_cache, model, prompt, system_instruction, temperature, max_tokens, True
+        )
+        if cached is not None:
+            return self._parse_json(cached)
+
+        response = self.generate(
+            prompt,
+            temperature,
+            max_tokens,
+            model=model,
+            use_cache=False,
+            stop_at_json=True,
+            system_instruction=system_instruction,
+        )
+        parsed = self._parse_json(response)
+        self._cache_store(cache, key, response)
+        return parsed
+
+    async def agenerate_json(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        model: Optional[genai.GenerativeModel] = None,
+        use_cache: bool = True,
+        system_instruction: Optional[str] = None,
+        cache: Optional[LLMCache] = None,
+    ) -> Dict[str, Any]:
+        """
+        Generate JSON response from LLM asynchronously.
+
+        Caches only responses that parse (see generate_json).
+        """
+        key, cached = await asyncio.to_thread(
+            self._cache_lookup,
+            cache, use_cache, model, prompt, system_instruction, temperature, max_tokens, True,
+        )
+        if cached is not None:
+            return self._parse_json(cached)
+
+        response = await self.agenerate(
+            prompt,
+            temperature,
+            max_tokens,
+            model=model,
+            use_cache=False,
+            stop_at_json=True,
+            system_instruction=system_instruction,
+        )
+        parsed = self._parse_json(response)
+        await asyncio.to_thread(self._cache_store, cache, key, response)
+        return parsed
+
+    def _cache_lookup(
+        self,
+        cache: Optional[LLMCache],
+        use_cache: bool,
+        model: Optional[genai.GenerativeModel],
+        prompt: str,
+        system_instruction: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        json_only: bool,
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Look a request up in the response cache.
+
+        Returns (key, cached response). key is None when the request must not
+        be cached, and the cached response is None on a miss.
+        """
+        if not self._should_cache(cache, use_cache, model, temperature):
+            return None, None
+        key = self._cache_key(prompt, system_instruction, temperature, max_tokens, json_only)
+        return key, cache.get(key)
+
+    @staticmethod
+    def _cache_store(cache: Optional[LLMCache], key: Optional[str], response: str):
+        """Store a response under a key from _cache_lookup; no-op for uncacheable requests."""
+        if key is not None:
+            cache.put(key, response)
+
+    @staticmethod
+    def _generation_config(temperature: float, max_tokens: int) -> genai.types.GenerationConfig:
+        """Build the sampling config for a request."""
+        return genai.types.GenerationConfig(
+            temperature=temperature,
+            max_output_tokens=max_tokens,
+        )
+
+    @staticmethod
+    def _should_cache(
+        cache: Optional[LLMCache],
+        use_cache: bool,
+        model: Optional[genai.GenerativeModel],
+        temperature: float,
+    ) -> bool:
+        """Decide whether a request may be served from / stored in the cache."""
+        # Calls against a context-cached model only carry the prompt tail,
+        # so they cannot be keyed on the prompt alone.
+        return (
+            cache is not None
+            and use_cache
+            and model is None
+            and temperature <= cache.max_temperature
+        )
+
+    def _cache_key(
+        self,
+        prompt: str,
+        system_instruction: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        json_only: bool,
+    ) -> str:
+        """Return the response-cache key for a request."""
+        return LLMCache.make_key(
+            self.model_name,
+            self._full_prompt(prompt, system_instruction),
+            temperature,
+            max_tokens,
+            json_only=json_only,
+        )
+
+    def _model_for(self, system_instruction: Optional[str]) -> genai.GenerativeModel:
+        """Return the model for a static system instruction, creating it once."""
+        if not system_instruction:
+            return self.model
+
+        with self._prefix_models_lock:
+            model = self._prefix_models.get(system_instruction)
+            if model is None:
+                model = genai.GenerativeModel(self.model_name, system_instruction=system_instruction)
+                self._prefix_models[system_instruction] = model
+            return model
+
+    @staticmethod
+    def _full_prompt(prompt: str, system_instruction: Optional[str]) -> str:
+        """Return the complete prompt text as seen by the model."""
+        if not system_instruction:
+            return prompt
+        return f"{system_instruction}\n\n{prompt}"
+
+    def create_cached_content(
+        self,
+        system_instruction: str,
+        shared_context: str,
+        ttl_seconds: int = 300,
+        min_tokens: int = 4096,
+    ) -> Optional[caching.CachedContent]:
+        """
+        Cache a static prompt prefix server-side.
+
+        Returns None without creating anything when the prefix is shorter than
+        min_tokens (the model's minimum cacheable size), and None with the
+        error logged when creation fails; callers then send the full prompt.
+        """
+        try:
+            prefix = self._model_for(system_instruction).count_tokens(shared_context)
+            if prefix.total_tokens < min_tokens:
+                return None
+            return caching.CachedContent.create(
+                model=self.model_name,
+                system_instruction=system_instruction,
+                contents=[shared_context],
+                ttl=timedelta(seconds=ttl_seconds),
+            )
+        except Exception as e:
+            get_logger("llm_client").log_error("LLMClient", "context_cache", f"create failed: {e}")
+            return None
+
+    def delete_cached_content(self, cache: caching.CachedContent):
+        """Delete a server-side prefix cache once its calls are done."""
         try:
-            return json.loads(response)
-        except json.JSONDecodeError:
-            if "```json" in response:
-                json_str = response.split("```json")[1].split("```")[0].strip()
-                return json.loads(json_str)
-            elif "```" in response:
-                json_str = response.split("```")[1].split("```")[0].strip()
-                return json.loads(json_str)
-            else:
-                raise ValueError(f"Could not parse JSON from response: {response[:200]}")
+            cache.delete()
+        except Exception as e:
+            get_logger("llm_client").log_error("LLMClient", "context_cache", f"delete failed: {e}")
+
+    @staticmethod
+    def _parse_json(response: str) -> Dict[str, Any]:
+        """Extract JSON from a raw LLM response."""
+        try:
+            return json_loads(response)
+        except ValueError:
+            pass
+
+        match = _JSON_FENCE.search(response)
+        if match:
+            return json_loads(match.group(1))
+
+        # No fence: decode the first JSON object embedded in surrounding prose
+        starts = [i for i in (response.find("{"), response.find("[")) if i != -1]
+        if starts:
+            try:
+                return json.JSONDecoder().raw_decode(response, min(starts))[0]
+            except json.JSONDecodeError:
+                pass
+
+        raise ValueError(f"Could not parse JSON from response: {response[:200]}")
 
 
 class BaseAgent(ABC):
     """Base class for all agents."""
 
-    def __init__(self, name: str, llm_client: LLMClient, config: Optional[Dict[str, Any]] = None):
-        """Initialize base agent."""
+    def __init__(
+        self,
+        name: str,
+        llm_client: LLMClient,
+        config: Optional[Dict[str, Any]] = None,
+        response_cache: Optional[LLMCache] = None,
+    ):
+        """
+        Initialize base agent.
+
+        response_cache is this agent's LLM response cache; None disables
+        response caching for the agent.
+        """
         self.name = name
         self.llm_client = llm_client
         self.config = config or {}
-        self.execution_history: List[Dict[str, Any]] = []
+        self.response_cache = response_cache
+        self.execution_history: Deque[Dict[str, Any]] = deque(maxlen=self.config.get('history_max', 1000))
 
     @abstractmethod
     def execute(self, task: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Execute agent task. Must be implemented by subclasses."""
         pass
 
-    def think(self, prompt: str, temperature: Optional[float] = None) -> str:
+    async def aexecute(self, task: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute agent task from an event loop.
+
+        Runs the synchronous execute in a worker thread by default; agents
+        with independent LLM calls override this with a native coroutine.
+        """
+        return await asyncio.to_thread(self.execute, task, context)
+
+    def think(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        system_instruction: Optional[str] = None,
+    ) -> str:
         """Agent thinking step."""
         temp = temperature or self.config.get('temperature', 0.7)
         max_tokens = self.config.get('max_tokens', 2048)
-        return self.llm_client.generate(prompt, temperature=temp, max_tokens=max_tokens)
+        return self.llm_client.generate(
+            prompt,
+            temperature=temp,
+            max_tokens=max_tokens,
+            system_instruction=system_instruction,
+            cache=self.response_cache,
+        )
 
-    def think_json(self, prompt: str, temperature: Optional[float] = None) -> Dict[str, Any]:
+    def think_json(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        system_instruction: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """Agent thinking step that returns JSON."""
         temp = temperature or self.config.get('temperature', 0.7)
         max_tokens = self.config.get('max_tokens', 2048)
-        return self.llm_client.generate_json(prompt, temperature=temp, max_tokens=max_tokens)
+        return self.llm_client.generate_json(
+            prompt,
+            temperature=temp,
+            max_tokens=max_tokens,
+            system_instruction=system_instruction,
+            cache=self.response_cache,
+        )
+
+    async def athink_json(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        model: Optional[genai.GenerativeModel] = None,
+        use_cache: bool = True,
+        system_instruction: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Async agent thinking step that returns JSON."""
+        temp = temperature or self.config.get('temperature', 0.7)
+        max_tokens = self.config.get('max_tokens', 2048)
+        return await self.llm_client.agenerate_json(
+            prompt,
+            temperature=temp,
+            max_tokens=max_tokens,
+            model=model,
+            use_cache=use_cache,
+            system_instruction=system_instruction,
+            cache=self.response_cache,
+        )
 
     def log_execution(self, task: str, result: Any):
         """Log agent execution."""
         self.execution_history.append({
-            "timestamp": datetime.now().isoformat(),
+            "ts_ns": time.time_ns(),
             "task": task,
             "result": result,
         })
 
-    def get_history(self) -> List[Dict[str, Any]]:
-        """Get execution history."""
-        return self.execution_history
+    def get_history(self, iso_timestamps: bool = True) -> List[Dict[str, Any]]:
+        """Get execution history, formatting timestamps only when requested."""
+        if not iso_timestamps:
+            return list(self.execution_history)
+
+        return [
+            {"timestamp": datetime.fromtimestamp(entry["ts_ns"] / 1e9).isoformat(), **entry}
+            for entry in self.execution_history
+        ]
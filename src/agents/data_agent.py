@@ -2,21 +2,46 @@
 Data Agent - Loads, summarizes, and analyzes the Facebook Ads dataset.
 """
 
-import json
+import os
 from typing import Dict, Any, Optional
 import pandas as pd
-from src.agents.base import BaseAgent, LLMClient
-from src.utils.data import DataLoader, DataSummary
+from src.agents.base import BaseAgent, LLMClient, load_prompt
+from src.utils.llm_cache import LLMCache
+from src.utils.serialization import json_dumps
+from src.utils.data import ANALYSIS_SECTIONS, DataLoader, DataSummary
+
+
+# Static system prefix for structuring findings
+_FINDINGS_SYSTEM_PROMPT = f"""{load_prompt('prompts/data_agent.md')}
+
+## Instruction
+
+Provide a comprehensive data summary matching the specified JSON schema. Include:
+1. High-level statistics
+2. Key segments breakdown
+3. Trend observations
+4. Quality notes
+5. Clear reasoning
+
+Return valid JSON only.
+"""
 
 
 class DataAgent(BaseAgent):
     """Agent that loads and summarizes Facebook Ads dataset."""
 
-    def __init__(self, name: str, llm_client: LLMClient, config: Optional[Dict[str, Any]] = None):
+    def __init__(
+        self,
+        name: str,
+        llm_client: LLMClient,
+        config: Optional[Dict[str, Any]] = None,
+        response_cache: Optional[LLMCache] = None,
+    ):
         """Initialize data agent."""
-        super().__init__(name, llm_client, config)
+        super().__init__(name, llm_client, config, response_cache)
         self.data_loader: Optional[DataLoader] = None
         self.df: Optional[pd.DataFrame] = None
+        self._loader_key: Optional[tuple] = None
 
     def execute(self, task: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -33,12 +58,26 @@ class DataAgent(BaseAgent):
         dataset_path = context.get('dataset_path', 'data/synthetic_fb_ads_undergarments.csv')
         sample_mode = context.get('sample_mode', False)
         sample_size = context.get('sample_size', 100)
+        parquet_cache = context.get('parquet_cache', True)
         analysis_requirements = context.get('analysis_requirements', [])
 
         try:
             
-            self.data_loader = DataLoader(dataset_path, sample_mode, sample_size)
-            self.df = self.data_loader.load()
+            # Reload when the settings change or the CSV is edited between runs;
+            # DataLoader.load then re-checks its Parquet cache against the CSV.
+            loader_key = (
+                dataset_path,
+                sample_mode,
+                sample_size,
+                parquet_cache,
+                os.stat(dataset_path).st_mtime_ns,
+            )
+            if self.data_loader is None or self._loader_key != loader_key:
+                self.data_loader = DataLoader(dataset_path, sample_mode, sample_size, parquet_cache)
+                self.df = self.data_loader.load()
+                if sample_mode:
+                    assert len(self.df) <= sample_size, "Sample mode loaded more rows than sample_size"
+                self._loader_key = loader_key
 
            
             summary = self.data_loader.get_summary()
@@ -47,18 +86,26 @@ class DataAgent(BaseAgent):
             
             analysis_results = self._perform_analysis(analysis_requirements)
 
-           
-            structured_findings = self._structure_findings(summary_dict, analysis_results)
-
-            self.log_execution(task, structured_findings)
-            return {
+            result = {
                 "status": "success",
                 "data_summary": summary_dict,
                 "analysis": analysis_results,
-                "structured_findings": structured_findings,
                 "record_count": len(self.df),
             }
 
+            # Callers that want to overlap structuring with other agents
+            # defer it and await astructure_findings themselves.
+            if context.get('defer_structuring', False):
+                return result
+
+            structured_findings = self._structure_findings(
+                summary_dict, analysis_results, analysis_requirements
+            )
+
+            self.log_execution(task, structured_findings)
+            result["structured_findings"] = structured_findings
+            return result
+
         except Exception as e:
             return {
                 "status": "error",
@@ -67,82 +114,88 @@ class DataAgent(BaseAgent):
 
     def _perform_analysis(self, requirements: list) -> Dict[str, Any]:
         """Perform specific analyses based on requirements."""
-        if not self.df is None:
-            return {}
-
-        analysis = {}
-
-       
-        if 'campaign_performance' in requirements or not requirements:
-            analysis['campaign_performance'] = self._analyze_campaign_performance()
-
-        
-        if 'creative_performance' in requirements or not requirements:
-            analysis['creative_performance'] = self.data_loader.get_creative_performance()
-
-        
-        if 'roas_timeline' in requirements or not requirements:
-            analysis['roas_timeline'] = self.data_loader.get_roas_timeline()[:10]  # Last 10 entries
-
-        
-        if 'low_ctr_campaigns' in requirements or not requirements:
-            low_ctr = self.data_loader.filter_low_ctr(threshold=0.012)
-            analysis['low_ctr_count'] = len(low_ctr)
-            analysis['low_ctr_campaigns'] = low_ctr[['campaign_name', 'adset_name', 'ctr', 'creative_message']].drop_duplicates().to_dict('records')[:5]
-
-        return analysis
-
-    def _analyze_campaign_performance(self) -> Dict[str, Any]:
-        """Analyze performance by campaign."""
         if self.df is None:
             return {}
 
-        campaign_perf = {}
-        for campaign in self.df['campaign_name'].unique():
-            campaign_data = self.df[self.df['campaign_name'] == campaign]
-            campaign_perf[campaign] = {
-                'avg_roas': float(campaign_data['roas'].mean()),
-                'avg_ctr': float(campaign_data['ctr'].mean()),
-                'total_spend': float(campaign_data['spend'].sum()),
-                'record_count': len(campaign_data),
-            }
-
-        return campaign_perf
+        return self.data_loader.compute_all(requirements, low_ctr_threshold=0.012)
 
-    def _structure_findings(self, summary: Dict[str, Any], analysis: Dict[str, Any]) -> Dict[str, Any]:
-        """Use LLM to structure findings."""
-        with open('prompts/data_agent.md', 'r') as f:
-            system_prompt = f.read()
+    def _analysis_has_required_keys(self, analysis: Dict[str, Any], requirements: list) -> bool:
+        """Check that every requested analysis section was produced."""
+        required = requirements or ANALYSIS_SECTIONS
+        return all(key in analysis for key in required)
 
-        findings_prompt = f"""{system_prompt}
+    def _structure_findings(
+        self,
+        summary: Dict[str, Any],
+        analysis: Dict[str, Any],
+        requirements: Optional[list] = None,
+    ) -> Dict[str, Any]:
+        """Structure findings, optionally polishing them with the LLM."""
+        if self._structure_locally(analysis, requirements or []):
+            return self._local_findings(summary, analysis)
 
-## Dataset Summary
-
-{json.dumps(summary, indent=2, default=str)}
+        try:
+            structured = self.think_json(
+                self._build_findings_prompt(summary, analysis),
+                temperature=0.2,
+                system_instruction=_FINDINGS_SYSTEM_PROMPT,
+            )
+            return structured
+        except Exception:
+            return self._local_findings(summary, analysis)
+
+    async def astructure_findings(
+        self,
+        task: str,
+        summary: Dict[str, Any],
+        analysis: Dict[str, Any],
+        requirements: Optional[list] = None,
+    ) -> Dict[str, Any]:
+        """Structure findings deferred from execute, without blocking the event loop."""
+        if self._structure_locally(analysis, requirements or []):
+            structured = self._local_findings(summary, analysis)
+        else:
+            try:
+                structured = await self.athink_json(
+                    self._build_findings_prompt(summary, analysis),
+                    temperature=0.2,
+                    system_instruction=_FINDINGS_SYSTEM_PROMPT,
+                )
+            except Exception:
+                structured = self._local_findings(summary, analysis)
+
+        self.log_execution(task, structured)
+        return structured
+
+    def _structure_locally(self, analysis: Dict[str, Any], requirements: list) -> bool:
+        """
+        Decide whether findings can be structured without the LLM.
 
-## Detailed Analysis
+        structuring_mode controls the LLM step: 'off' always structures
+        locally, 'fallback' (default) only calls the LLM when the local
+        analysis is incomplete, and 'llm' always calls it.
+        """
+        mode = self.config.get('structuring_mode', 'fallback')
+        if mode == 'off':
+            return True
+        return mode == 'fallback' and self._analysis_has_required_keys(analysis, requirements)
 
-{json.dumps(analysis, indent=2, default=str)}
+    def _build_findings_prompt(self, summary: Dict[str, Any], analysis: Dict[str, Any]) -> str:
+        """Build the per-call LLM prompt for structuring findings."""
+        return f"""## Dataset Summary
 
-## Instruction
+{json_dumps(summary, indent=False)}
 
-Provide a comprehensive data summary matching the specified JSON schema. Include:
-1. High-level statistics
-2. Key segments breakdown
-3. Trend observations
-4. Quality notes
-5. Clear reasoning
+## Detailed Analysis
 
-Return valid JSON only.
+{json_dumps(analysis, indent=False)}
 """
 
-        try:
-            structured = self.think_json(findings_prompt, temperature=0.2)
-            return structured
-        except Exception:
-            return {
-                "summary": summary,
-                "key_segments": analysis,
-                "trend_observations": ["Data loaded successfully"],
-                "reasoning": "Basic data analysis completed"
-            }
+    def _local_findings(self, summary: Dict[str, Any], analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Structure findings locally without an LLM call."""
+        return {
+            "summary": summary,
+            "key_segments": analysis,
+            "trend_observations": ["Data loaded successfully"],
+            "reasoning": "Basic data analysis completed"
+        }
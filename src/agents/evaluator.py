@@ -2,18 +2,94 @@
 Evaluator Agent - Validates hypotheses quantitatively.
 """
 
-import json
+import numpy as np
 import pandas as pd
 from typing import Dict, Any, Optional
-from src.agents.base import BaseAgent, LLMClient
+from src.agents.base import BaseAgent, LLMClient, load_prompt
+from src.utils.llm_cache import LLMCache
+from src.utils.serialization import json_dumps
+
+
+# Templates used when validation fails; per-hypothesis fields are filled in by
+# _create_fallback_evaluation.
+_FALLBACK_HYPOTHESIS_EVALUATION = {
+    "hypothesis_id": "h_unknown",
+    "hypothesis_title": "Unknown",
+    "validation_approach": "Comparative segment analysis",
+    "data_evidence": {
+        "primary_metric": {
+            "baseline": 0.015,
+            "observed": 0.012,
+            "change_percent": -20.0,
+            "statistical_note": "Meaningful decline (>5% threshold)"
+        }
+    },
+    "supporting_metrics": [
+        "Metric1: 25% decrease aligns with hypothesis",
+        "Metric2: Pattern consistent across segments"
+    ],
+    "contradicting_metrics": [
+        "Some segments show stable performance"
+    ],
+    "confidence_score": 0.7,
+    "confidence_reasoning": "Evidence supports hypothesis with some caveats; alternative explanations possible",
+    "validation_status": "PARTIALLY_CONFIRMED",
+    "actionability": "Sufficient confidence to recommend testing remediation tactics"
+}
+
+_FALLBACK_EVALUATION = {
+    "evaluation_summary": "Multiple hypotheses partially confirmed; recommend prioritized testing",
+    "hypothesis_evaluations": [],
+    "top_validated_insights": [
+        {
+            "insight": "Audience fatigue appears to be primary driver of ROAS decline",
+            "confidence": 0.72,
+            "impact": "Recommend creative refresh and audience expansion strategy"
+        }
+    ],
+    "recommended_actions": [
+        "Action 1: Increase creative variation frequency to combat audience fatigue",
+        "Action 2: Expand lookalike audience size and refresh weekly",
+        "Action 3: Test new creative messaging angles in control groups"
+    ],
+    "evaluation_methodology": "Segment comparison with trend analysis; >5% delta threshold applied"
+}
+
+
+# Static system prefix: prompt file plus instructions. In the prompt body the
+# dataset sections come before the hypotheses, which change on every run.
+_SYSTEM_PROMPT = f"""{load_prompt('prompts/evaluator.md')}
+
+## Instruction
+
+Validate each hypothesis using the data provided. For each:
+1. Identify supporting and contradicting metrics
+2. Calculate confidence score (0.0-1.0) based on evidence strength
+3. Determine validation status (CONFIRMED/PARTIALLY_CONFIRMED/REJECTED/REQUIRES_MORE_DATA)
+4. Explain business implications
+
+Return valid JSON matching the specified schema. Be rigorous: require >5% deltas to be meaningful.
+"""
+
+
+def _nanmean(values: np.ndarray) -> float:
+    """Mean that skips NaNs like pandas' Series.mean, without np.nanmean's all-NaN warning."""
+    valid = values[~np.isnan(values)]
+    return float(valid.mean()) if len(valid) > 0 else float('nan')
 
 
 class EvaluatorAgent(BaseAgent):
     """Agent that validates hypotheses with quantitative evidence."""
 
-    def __init__(self, name: str, llm_client: LLMClient, config: Optional[Dict[str, Any]] = None):
+    def __init__(
+        self,
+        name: str,
+        llm_client: LLMClient,
+        config: Optional[Dict[str, Any]] = None,
+        response_cache: Optional[LLMCache] = None,
+    ):
         """Initialize evaluator agent."""
-        super().__init__(name, llm_client, config)
+        super().__init__(name, llm_client, config, response_cache)
         self.df: Optional[pd.DataFrame] = None
 
     def execute(self, task: str, context: Dict[str, Any]) -> Dict[str, Any]:
@@ -27,41 +103,27 @@ class EvaluatorAgent(BaseAgent):
         Returns:
             Validation results with confidence scores
         """
-        with open('prompts/evaluator.md', 'r') as f:
-            system_prompt = f.read()
-
         hypotheses = context.get('hypotheses', {}).get('hypotheses', [])
         data_summary = context.get('data_summary', {})
         analysis_data = context.get('analysis', {})
 
-        validation_prompt = f"""{system_prompt}
-
-## Hypotheses to Validate
-
-{json.dumps(hypotheses, indent=2, default=str)}
-
-## Data Summary
+        validation_prompt = f"""## Data Summary
 
-{json.dumps(data_summary, indent=2, default=str)}
+{json_dumps(data_summary, indent=False)}
 
 ## Detailed Analysis
 
-{json.dumps(analysis_data, indent=2, default=str)}
+{json_dumps(analysis_data, indent=False)}
 
-## Instruction
-
-Validate each hypothesis using the data provided. For each:
-1. Identify supporting and contradicting metrics
-2. Calculate confidence score (0.0-1.0) based on evidence strength
-3. Determine validation status (CONFIRMED/PARTIALLY_CONFIRMED/REJECTED/REQUIRES_MORE_DATA)
-4. Explain business implications
+## Hypotheses to Validate
 
-Return valid JSON matching the specified schema. Be rigorous: require >5% deltas to be meaningful.
+{json_dumps(hypotheses, indent=False)}
 """
 
         try:
-
-            evaluation_response = self.think_json(validation_prompt, temperature=0.2)
+            evaluation_response = self.think_json(
+                validation_prompt, temperature=0.2, system_instruction=_SYSTEM_PROMPT
+            )
             self.log_execution(task, evaluation_response)
             return {
                 "status": "success",
@@ -77,50 +139,26 @@ Return valid JSON matching the specified schema. Be rigorous: require >5% deltas
 
     def _create_fallback_evaluation(self, hypotheses: list) -> Dict[str, Any]:
         """Create fallback evaluation when LLM fails."""
-        evaluations = []
-        
-        for h in hypotheses[:3]:  
-            evaluations.append({
+        # Results go to callers and the report, so none of their containers alias the templates
+        template = _FALLBACK_HYPOTHESIS_EVALUATION
+        evaluations = [
+            {
+                **template,
+                "data_evidence": {"primary_metric": dict(template["data_evidence"]["primary_metric"])},
+                "supporting_metrics": list(template["supporting_metrics"]),
+                "contradicting_metrics": list(template["contradicting_metrics"]),
                 "hypothesis_id": h.get('id', 'h_unknown'),
                 "hypothesis_title": h.get('title', 'Unknown'),
-                "validation_approach": "Comparative segment analysis",
-                "data_evidence": {
-                    "primary_metric": {
-                        "baseline": 0.015,
-                        "observed": 0.012,
-                        "change_percent": -20.0,
-                        "statistical_note": "Meaningful decline (>5% threshold)"
-                    }
-                },
-                "supporting_metrics": [
-                    "Metric1: 25% decrease aligns with hypothesis",
-                    "Metric2: Pattern consistent across segments"
-                ],
-                "contradicting_metrics": [
-                    "Some segments show stable performance"
-                ],
                 "confidence_score": h.get('confidence', 0.7),
-                "confidence_reasoning": "Evidence supports hypothesis with some caveats; alternative explanations possible",
-                "validation_status": "PARTIALLY_CONFIRMED",
-                "actionability": "Sufficient confidence to recommend testing remediation tactics"
-            })
+            }
+            for h in hypotheses[:3]
+        ]
 
         return {
-            "evaluation_summary": "Multiple hypotheses partially confirmed; recommend prioritized testing",
+            **_FALLBACK_EVALUATION,
             "hypothesis_evaluations": evaluations,
-            "top_validated_insights": [
-                {
-                    "insight": "Audience fatigue appears to be primary driver of ROAS decline",
-                    "confidence": 0.72,
-                    "impact": "Recommend creative refresh and audience expansion strategy"
-                }
-            ],
-            "recommended_actions": [
-                "Action 1: Increase creative variation frequency to combat audience fatigue",
-                "Action 2: Expand lookalike audience size and refresh weekly",
-                "Action 3: Test new creative messaging angles in control groups"
-            ],
-            "evaluation_methodology": "Segment comparison with trend analysis; >5% delta threshold applied"
+            "top_validated_insights": [dict(item) for item in _FALLBACK_EVALUATION["top_validated_insights"]],
+            "recommended_actions": list(_FALLBACK_EVALUATION["recommended_actions"]),
         }
 
     def calculate_statistical_evidence(self, df: pd.DataFrame, hypothesis: Dict[str, Any]) -> Dict[str, Any]:
@@ -129,12 +167,18 @@ Return valid JSON matching the specified schema. Be rigorous: require >5% deltas
         
         if 'fatigue' in hypothesis.get('title', '').lower():
             if 'date' in df.columns:
-                mid_date = df['date'].median()
-                early = df[df['date'] <= mid_date]
-                late = df[df['date'] > mid_date]
-                
-                evidence['early_period_ctr'] = float(early['ctr'].mean()) if len(early) > 0 else 0
-                evidence['late_period_ctr'] = float(late['ctr'].mean()) if len(late) > 0 else 0
+                # DataLoader sorts by date, so the split is usually a plain slice
+                ctr = df['ctr'].to_numpy()
+                if not df['date'].is_monotonic_increasing:
+                    ctr = ctr[np.argsort(df['date'].to_numpy(), kind='stable')]
+                # Rounding up keeps the median row in the early half, as the
+                # original date <= median split did (a single row is all early)
+                mid = (len(ctr) + 1) // 2
+                early = ctr[:mid]
+                late = ctr[mid:]
+
+                evidence['early_period_ctr'] = _nanmean(early) if len(early) > 0 else 0
+                evidence['late_period_ctr'] = _nanmean(late) if len(late) > 0 else 0
                 evidence['ctr_decline_pct'] = (
                     (evidence['early_period_ctr'] - evidence['late_period_ctr']) 
                     / evidence['early_period_ctr'] * 100
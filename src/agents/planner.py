@@ -2,9 +2,26 @@
 Planner Agent - Decomposes user queries into structured analysis subtasks.
 """
 
-import json
 from typing import Dict, Any
-from src.agents.base import BaseAgent, LLMClient
+from src.agents.base import BaseAgent, LLMClient, load_prompt
+from src.utils.serialization import json_dumps
+
+
+# Static system prefix: prompt file plus instructions; the query and context
+# that change per call go in the prompt body.
+_SYSTEM_PROMPT = f"""{load_prompt('prompts/planner.md')}
+
+## Instruction
+
+Decompose the user's query into a structured analysis plan. Return a valid JSON object matching the specified schema. Focus on:
+1. Identifying the core question (ROAS drop, CTR optimization, creative assessment, etc.)
+2. Breaking into 3-4 clear subtasks for different agents
+3. Defining exact data requirements
+4. Outlining validation approach
+5. Specifying success criteria
+
+Ensure the JSON is valid and complete.
+"""
 
 
 class PlannerAgent(BaseAgent):
@@ -21,36 +38,20 @@ class PlannerAgent(BaseAgent):
         Returns:
             Structured analysis plan
         """
-        
-        with open('prompts/planner.md', 'r') as f:
-            system_prompt = f.read()
-        
-        
-        analysis_prompt = f"""{system_prompt}
 
-## User Query
+        analysis_prompt = f"""## Available Data Context
 
-{task}
-
-## Available Data Context
-
-{json.dumps(context, indent=2, default=str)}
-
-## Instruction
+{json_dumps(context, indent=False)}
 
-Decompose the user's query into a structured analysis plan. Return a valid JSON object matching the specified schema. Focus on:
-1. Identifying the core question (ROAS drop, CTR optimization, creative assessment, etc.)
-2. Breaking into 3-4 clear subtasks for different agents
-3. Defining exact data requirements
-4. Outlining validation approach
-5. Specifying success criteria
+## User Query
 
-Ensure the JSON is valid and complete.
+{task}
 """
-        
-        
+
         try:
-            plan_response = self.think_json(analysis_prompt, temperature=0.3)
+            plan_response = self.think_json(
+                analysis_prompt, temperature=0.3, system_instruction=_SYSTEM_PROMPT
+            )
             self.log_execution(task, plan_response)
             return {
                 "status": "success",
@@ -2,10 +2,12 @@
 Orchestrator - Coordinates agent execution and data flow.
 """
 
-import json
+import asyncio
 import os
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple
 from datetime import datetime
 
 from src.agents import (
@@ -15,14 +17,50 @@ from src.agents import (
     InsightAgent,
     EvaluatorAgent,
     CreativeGeneratorAgent,
+    run_sync,
 )
-from src.utils import get_logger, get_config
+from src.utils import get_logger, get_config, json_dumpb, Config, LLMCache
+
+
+# Analysis sections the data agent is asked for on every run
+ANALYSIS_REQUIREMENTS = (
+    "campaign_performance",
+    "creative_performance",
+    "roas_timeline",
+    "low_ctr_campaigns",
+)
+
+
+@dataclass(frozen=True)
+class PipelineContext:
+    """Config-derived settings shared by every stage of one pipeline run."""
+
+    # Explicit slots rather than slots=True, which needs Python 3.10
+    __slots__ = ("dataset_path", "sample_mode", "sample_size", "parquet_cache", "thresholds")
+
+    dataset_path: str
+    sample_mode: bool
+    sample_size: int
+    parquet_cache: bool
+    thresholds: Mapping[str, Any]
+
+    @classmethod
+    def from_config(cls, config: Config) -> "PipelineContext":
+        """Snapshot the data and threshold settings from config."""
+        data_config = config.get_dict("data")
+        return cls(
+            dataset_path=data_config.get("dataset_path", "data/synthetic_fb_ads_undergarments.csv"),
+            sample_mode=data_config.get("sample_mode", True),
+            sample_size=data_config.get("sample_size", 100),
+            parquet_cache=data_config.get("parquet_cache", True),
+            thresholds=MappingProxyType(dict(config.get_dict("thresholds"))),
+        )
 
 
 class AgentOrchestrator:
     """Orchestrates execution of multiple agents in a pipeline."""
 
-    def __init__(self, config_path: str = "config/config.yaml"):
+    def __init__(self, config_path: str = "config/config.yaml", use_cache: bool = True):
         """Initialize orchestrator."""
         self.config = get_config(config_path)
         self.logger = get_logger("orchestrator", self.config.get("logging.output_dir", "logs"))
@@ -30,10 +68,20 @@ class AgentOrchestrator:
         
         api_key = os.getenv("GOOGLE_API_KEY") or self.config.get("model.api_key_env")
         model_name = self.config.get("model.name", "gemini-2.0-flash")
-        self.llm_client = LLMClient(api_key=api_key, model_name=model_name)
+        self.llm_client = LLMClient.get(api_key=api_key, model_name=model_name)
+        # The client is shared across orchestrators, so the cache policy
+        # lives here and is handed to this orchestrator's agents.
+        self.response_cache: Optional[LLMCache] = None
+        if use_cache and self.config.get("llm_cache.enabled", True):
+            self.response_cache = LLMCache(
+                self.config.get("llm_cache.cache_dir", "logs/llm_cache"),
+                ttl_seconds=self.config.get("llm_cache.ttl_seconds"),
+                max_temperature=self.config.get("llm_cache.max_temperature", 0.7),
+            )
         
         
         self._init_agents()
+        self._init_output_paths()
         
         
         self.execution_trace = []
@@ -41,19 +89,36 @@ class AgentOrchestrator:
 
     def _init_agents(self):
         """Initialize all agents."""
-        planner_config = self.config.get_dict("agents").get("planner", {})
-        data_config = self.config.get_dict("agents").get("data_agent", {})
-        insight_config = self.config.get_dict("agents").get("insight_agent", {})
-        evaluator_config = self.config.get_dict("agents").get("evaluator", {})
-        creative_config = self.config.get_dict("agents").get("creative_generator", {})
-
-        self.planner_agent = PlannerAgent("Planner", self.llm_client, planner_config)
-        self.data_agent = DataAgent("DataAgent", self.llm_client, data_config)
-        self.insight_agent = InsightAgent("InsightAgent", self.llm_client, insight_config)
-        self.evaluator_agent = EvaluatorAgent("Evaluator", self.llm_client, evaluator_config)
-        self.creative_agent = CreativeGeneratorAgent("CreativeGenerator", self.llm_client, creative_config)
+        agents_config = self.config.get_dict("agents")
+        planner_config = agents_config.get("planner", {})
+        data_config = agents_config.get("data_agent", {})
+        insight_config = agents_config.get("insight_agent", {})
+        evaluator_config = agents_config.get("evaluator", {})
+        creative_config = agents_config.get("creative_generator", {})
+
+        cache = self.response_cache
+        self.planner_agent = PlannerAgent("Planner", self.llm_client, planner_config, cache)
+        self.data_agent = DataAgent("DataAgent", self.llm_client, data_config, cache)
+        self.insight_agent = InsightAgent("InsightAgent", self.llm_client, insight_config, cache)
+        self.evaluator_agent = EvaluatorAgent("Evaluator", self.llm_client, evaluator_config, cache)
+        self.creative_agent = CreativeGeneratorAgent("CreativeGenerator", self.llm_client, creative_config, cache)
+
+    def _init_output_paths(self):
+        """Resolve output paths and create their directories once."""
+        output_config = self.config.get_dict("output")
+        self.insights_path = Path(output_config.get("insights_path", "reports/insights.json"))
+        self.creatives_path = Path(output_config.get("creatives_path", "reports/creatives.json"))
+        self.report_path = Path(output_config.get("report_path", "reports/report.md"))
+
+        Path(output_config.get("logs_path", "logs")).mkdir(parents=True, exist_ok=True)
+        for path in (self.insights_path, self.creatives_path, self.report_path):
+            path.parent.mkdir(parents=True, exist_ok=True)
 
     def execute(self, user_query: str) -> Dict[str, Any]:
+        """Execute full analysis pipeline (synchronous wrapper around aexecute)."""
+        return run_sync(self.aexecute(user_query))
+
+    async def aexecute(self, user_query: str) -> Dict[str, Any]:
         """
         Execute full analysis pipeline.
         
@@ -65,47 +130,43 @@ class AgentOrchestrator:
         """
         execution_id = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.logger.log_metrics({"execution_start": execution_id, "query": user_query})
+        pipeline = PipelineContext.from_config(self.config)
 
         try:
             
-            print("\n Step 1: Planning Analysis...")
-            plan_context = self._prepare_plan_context()
-            plan_result = self.planner_agent.execute(user_query, plan_context)
+            print("\n Step 1-2: Planning Analysis and Loading Data...")
+            plan_context = self._prepare_plan_context(pipeline)
+            data_context = self._prepare_data_context(pipeline)
+            # The planner and the data agent have no dependency on each other
+            plan_result, data_result = await asyncio.gather(
+                self.planner_agent.aexecute(user_query, plan_context),
+                self.data_agent.aexecute(user_query, data_context),
+            )
             self._record_execution("planner", plan_result)
-            print(f"   ✓ Plan created with {len(plan_result.get('plan', {}).get('subtasks', []))} subtasks")
-
-            
-            print("\n Step 2: Loading and Analyzing Data...")
-            data_context = self._prepare_data_context()
-            data_result = self.data_agent.execute(user_query, data_context)
             self._record_execution("data_agent", data_result)
+            print(f"   ✓ Plan created with {len(plan_result.get('plan', {}).get('subtasks', []))} subtasks")
             print(f"   ✓ Data loaded: {data_result.get('record_count', 0)} records")
 
             
-            print("\n Step 3: Generating Hypotheses...")
-            insight_context = self._prepare_insight_context(plan_result, data_result)
-            insight_result = self.insight_agent.execute(user_query, insight_context)
+            print("\n Step 3-5: Generating Hypotheses, Validating, and Generating Creatives...")
+            # Creative generation only needs the data analysis, so it runs
+            # alongside the insight -> evaluator chain.
+            creative_context = self._prepare_creative_context(data_result)
+            (insight_result, eval_result), creative_result = await asyncio.gather(
+                self._run_insight_and_evaluation(user_query, plan_result, data_context, data_result),
+                self.creative_agent.aexecute(user_query, creative_context),
+            )
             self._record_execution("insight_agent", insight_result)
+            self._record_execution("evaluator", eval_result)
+            self._record_execution("creative_generator", creative_result)
             hypothesis_count = len(insight_result.get('hypotheses', {}).get('hypotheses', []))
             print(f"   ✓ Generated {hypothesis_count} hypotheses")
-
-           
-            print("\n Step 4: Validating Hypotheses...")
-            eval_context = self._prepare_eval_context(insight_result, data_result)
-            eval_result = self.evaluator_agent.execute(user_query, eval_context)
-            self._record_execution("evaluator", eval_result)
             print(f"   ✓ Validation complete")
-
-            
-            print("\n Step 5: Generating Creative Recommendations...")
-            creative_context = self._prepare_creative_context(data_result)
-            creative_result = self.creative_agent.execute(user_query, creative_context)
-            self._record_execution("creative_generator", creative_result)
             print(f"   ✓ Generated {creative_result.get('count', 0)} creative recommendations")
 
             
             print("\n Step 6: Compiling Report...")
-            final_report = self._compile_report(
+            final_report = await self._compile_report(
                 user_query,
                 plan_result,
                 data_result,
@@ -115,6 +176,9 @@ class AgentOrchestrator:
                 execution_id
             )
 
+            if self.response_cache is not None:
+                self.logger.log_metrics({"llm_cache": self.response_cache.stats()})
+
             print("\n Analysis Complete!\n")
             return final_report
 
@@ -127,30 +191,67 @@ class AgentOrchestrator:
                 "execution_id": execution_id,
             }
 
-    def _prepare_plan_context(self) -> Dict[str, Any]:
+    def _prepare_plan_context(self, pipeline: PipelineContext) -> Dict[str, Any]:
         """Prepare context for planner agent."""
-        data_config = self.config.get_dict("data")
         return {
-            "sample_mode": data_config.get("sample_mode", True),
-            "sample_size": data_config.get("sample_size", 100),
-            "thresholds": self.config.get_dict("thresholds"),
+            "sample_mode": pipeline.sample_mode,
+            "sample_size": pipeline.sample_size,
+            "thresholds": dict(pipeline.thresholds),
         }
 
-    def _prepare_data_context(self) -> Dict[str, Any]:
+    def _prepare_data_context(self, pipeline: PipelineContext) -> Dict[str, Any]:
         """Prepare context for data agent."""
-        data_config = self.config.get_dict("data")
         return {
-            "dataset_path": data_config.get("dataset_path", "data/synthetic_fb_ads_undergarments.csv"),
-            "sample_mode": data_config.get("sample_mode", True),
-            "sample_size": data_config.get("sample_size", 100),
-            "analysis_requirements": [
-                "campaign_performance",
-                "creative_performance",
-                "roas_timeline",
-                "low_ctr_campaigns"
-            ],
+            "dataset_path": pipeline.dataset_path,
+            "sample_mode": pipeline.sample_mode,
+            "sample_size": pipeline.sample_size,
+            "parquet_cache": pipeline.parquet_cache,
+            "analysis_requirements": list(ANALYSIS_REQUIREMENTS),
+            "defer_structuring": True,
         }
 
+    async def _run_insight_and_evaluation(
+        self,
+        user_query: str,
+        plan_result: Dict[str, Any],
+        data_context: Dict[str, Any],
+        data_result: Dict[str, Any],
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Generate hypotheses, then validate them."""
+        insight_context = self._prepare_insight_context(plan_result, data_result)
+        # Hypothesis generation only needs the raw analysis, so it can run
+        # alongside the data agent's deferred structuring step.
+        insight_result = await self._run_insight_and_structuring(
+            user_query, insight_context, data_context, data_result
+        )
+
+        eval_context = self._prepare_eval_context(insight_result, data_result)
+        eval_result = await self.evaluator_agent.aexecute(user_query, eval_context)
+        return insight_result, eval_result
+
+    async def _run_insight_and_structuring(
+        self,
+        user_query: str,
+        insight_context: Dict[str, Any],
+        data_context: Dict[str, Any],
+        data_result: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Run the insight agent concurrently with the data agent's structuring step."""
+        if data_result.get("status") != "success":
+            return await self.insight_agent.aexecute(user_query, insight_context)
+
+        insight_result, structured_findings = await asyncio.gather(
+            self.insight_agent.aexecute(user_query, insight_context),
+            self.data_agent.astructure_findings(
+                user_query,
+                data_result["data_summary"],
+                data_result["analysis"],
+                data_context.get("analysis_requirements", []),
+            ),
+        )
+        data_result["structured_findings"] = structured_findings
+        return insight_result
+
     def _prepare_insight_context(self, plan_result: Dict[str, Any], data_result: Dict[str, Any]) -> Dict[str, Any]:
         """Prepare context for insight agent."""
         return {
@@ -183,7 +284,7 @@ class AgentOrchestrator:
         })
         self.results[agent_name] = result
 
-    def _compile_report(
+    async def _compile_report(
         self,
         query: str,
         plan: Dict[str, Any],
@@ -207,38 +308,26 @@ class AgentOrchestrator:
             "execution_trace": self.execution_trace,
         }
 
-        self._save_outputs(report)
+        await self._save_outputs(report)
 
         return report
 
-    def _save_outputs(self, report: Dict[str, Any]):
-        """Save analysis outputs to files."""
-        output_config = self.config.get_dict("output")
-        
-
-        Path(output_config.get("logs_path", "logs")).mkdir(parents=True, exist_ok=True)
-        Path(output_config.get("insights_path", "reports/insights.json")).parent.mkdir(parents=True, exist_ok=True)
-
-        
-        insights_path = output_config.get("insights_path", "reports/insights.json")
-        with open(insights_path, 'w') as f:
-            json.dump(report.get("insights", {}), f, indent=2, default=str)
-        print(f"   ✓ Saved insights to {insights_path}")
-
-        
-        creatives_path = output_config.get("creatives_path", "reports/creatives.json")
-        with open(creatives_path, 'w') as f:
-            json.dump(report.get("creative_recommendations", []), f, indent=2, default=str)
-        print(f"   ✓ Saved creatives to {creatives_path}")
-
-       
-        report_path = output_config.get("report_path", "reports/report.md")
-        self._generate_markdown_report(report, report_path)
-        print(f"   ✓ Saved report to {report_path}")
+    async def _save_outputs(self, report: Dict[str, Any]):
+        """Save analysis outputs to files; the three writes are independent."""
+        await asyncio.gather(
+            asyncio.to_thread(self.insights_path.write_bytes, json_dumpb(report.get("insights", {}))),
+            asyncio.to_thread(
+                self.creatives_path.write_bytes, json_dumpb(report.get("creative_recommendations", []))
+            ),
+            asyncio.to_thread(self._generate_markdown_report, report, str(self.report_path)),
+        )
+        print(f"   ✓ Saved insights to {self.insights_path}")
+        print(f"   ✓ Saved creatives to {self.creatives_path}")
+        print(f"   ✓ Saved report to {self.report_path}")
 
     def _generate_markdown_report(self, report: Dict[str, Any], output_path: str):
         """Generate markdown summary report."""
-        markdown = f"""# Facebook Ads Performance Analysis Report
+        parts = [f"""# Facebook Ads Performance Analysis Report
 
 **Execution ID**: {report.get('execution_id')}  
 **Generated**: {report.get('timestamp')}
@@ -257,36 +346,35 @@ class AgentOrchestrator:
 
 ### Validated Hypotheses
 
-"""
-        
-        
+"""]
+
         evaluation = report.get('evaluation', {})
-        for eval_item in evaluation.get('hypothesis_evaluations', [])[:3]:
-            markdown += f"""
+        parts.append("".join(
+            f"""
 **{eval_item.get('hypothesis_title', 'Unknown')}**
 - Status: {eval_item.get('validation_status', 'N/A')}
 - Confidence: {eval_item.get('confidence_score', 0):.2%}
 - Action: {eval_item.get('actionability', 'N/A')}
 
 """
-
-        
-        markdown += "\n## Recommended Actions\n\n"
-        for action in evaluation.get('recommended_actions', []):
-            markdown += f"- {action}\n"
-
-        
-        markdown += f"\n## Creative Recommendations\n\n"
-        markdown += f"Generated {len(report.get('creative_recommendations', []))} new creative variations for low-CTR campaigns.\n\n"
-        for i, rec in enumerate(report.get('creative_recommendations', [])[:2], 1):
-            if isinstance(rec, dict) and 'creative_recommendations' in rec:
-                for creative in rec.get('creative_recommendations', [])[:1]:
-                    markdown += f"### Campaign {i}\n"
-                    markdown += f"**{creative.get('headline', 'N/A')}**\n"
-                    markdown += f"- Angle: {creative.get('creative_angle', 'N/A')}\n"
-                    markdown += f"- Predicted Lift: {creative.get('predicted_lift', 'N/A')}\n\n"
-
-        markdown += f"\n---\n*Report generated by Agentic Facebook Analyst*\n"
-
-        with open(output_path, 'w') as f:
-            f.write(markdown)
+            for eval_item in evaluation.get('hypothesis_evaluations', [])[:3]
+        ))
+
+        parts.append("\n## Recommended Actions\n\n")
+        parts.append("".join(f"- {action}\n" for action in evaluation.get('recommended_actions', [])))
+
+        parts.append("\n## Creative Recommendations\n\n")
+        parts.append(f"Generated {len(report.get('creative_recommendations', []))} new creative variations for low-CTR campaigns.\n\n")
+        parts.append("".join(
+            f"### Campaign {i}\n"
+            f"**{creative.get('headline', 'N/A')}**\n"
+            f"- Angle: {creative.get('creative_angle', 'N/A')}\n"
+            f"- Predicted Lift: {creative.get('predicted_lift', 'N/A')}\n\n"
+            for i, rec in enumerate(report.get('creative_recommendations', [])[:2], 1)
+            if isinstance(rec, dict) and 'creative_recommendations' in rec
+            for creative in rec.get('creative_recommendations', [])[:1]
+        ))
+
+        parts.append("\n---\n*Report generated by Agentic Facebook Analyst*\n")
+
+        Path(output_path).write_text("".join(parts), encoding="utf-8")
@@ -2,15 +2,24 @@
 Utilities module for the Agentic Facebook Analyst.
 """
 
-from .logging import StructuredLogger, get_logger
-from .config import Config, get_config
+from .logging import StructuredLogger, get_logger, reset_loggers
+from .config import Config, get_config, reset_config
 from .data import DataLoader, DataSummary
+from .llm_cache import LLMCache
+from .serialization import json_dumps, json_dumpb, json_loads, to_native
 
 __all__ = [
     'StructuredLogger',
     'get_logger',
+    'reset_loggers',
     'Config',
     'get_config',
+    'reset_config',
     'DataLoader',
     'DataSummary',
+    'LLMCache',
+    'json_dumps',
+    'json_dumpb',
+    'json_loads',
+    'to_native',
 ]
@@ -2,6 +2,7 @@
 Configuration loader for the Agentic Facebook Analyst system.
 """
 
+import threading
 import yaml
 from pathlib import Path
 from typing import Any, Dict, Optional
@@ -14,6 +15,8 @@ class Config:
         """Initialize configuration from YAML file."""
         self.config_path = config_path
         self.config: Dict[str, Any] = {}
+        self._flat: Dict[str, Any] = {}
+        self._mtime: Optional[float] = None
         self.load()
 
     def load(self):
@@ -22,20 +25,35 @@ class Config:
         if not config_file.exists():
             raise FileNotFoundError(f"Config file not found: {self.config_path}")
         
+        self._mtime = config_file.stat().st_mtime
         with open(config_file, 'r') as f:
-            self.config = yaml.safe_load(f)
+            self.config = yaml.safe_load(f) or {}
+
+        self._flat = {}
+        self._flatten(self.config, "")
+
+    def reload_if_changed(self) -> bool:
+        """Re-read the YAML file if it was modified since the last load."""
+        try:
+            mtime = Path(self.config_path).stat().st_mtime
+        except FileNotFoundError:
+            return False
+        if mtime == self._mtime:
+            return False
+        self.load()
+        return True
+
+    def _flatten(self, node: Dict[str, Any], prefix: str):
+        """Index every section and leaf under its dotted path."""
+        for k, value in node.items():
+            path = f"{prefix}{k}"
+            self._flat[path] = value
+            if isinstance(value, dict):
+                self._flatten(value, f"{path}.")
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value by dot notation (e.g., 'model.name')."""
-        keys = key.split('.')
-        value = self.config
-        
-        try:
-            for k in keys:
-                value = value[k]
-            return value
-        except (KeyError, TypeError):
-            return default
+        return self._flat.get(key, default)
 
     def get_dict(self, section: str) -> Dict[str, Any]:
         """Get entire configuration section."""
@@ -50,12 +68,21 @@ class Config:
 
 
 
-_config_instance: Optional[Config] = None
+_configs: Dict[str, Config] = {}
+_configs_lock = threading.Lock()
 
 
 def get_config(config_path: str = "config/config.yaml") -> Config:
-    """Get or create global config instance."""
-    global _config_instance
-    if _config_instance is None:
-        _config_instance = Config(config_path)
-    return _config_instance
+    """Get or create the shared config instance, reloading it if the file changed."""
+    with _configs_lock:
+        config = _configs.get(config_path)
+        if config is None:
+            config = _configs[config_path] = Config(config_path)
+    config.reload_if_changed()
+    return config
+
+
+def reset_config():
+    """Drop the shared config instances so the next get_config() loads afresh."""
+    with _configs_lock:
+        _configs.clear()
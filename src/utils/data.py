@@ -2,44 +2,121 @@
 Data utilities for loading and summarizing Facebook Ads dataset.
 """
 
-import pandas as pd
+import hashlib
 import json
+import os
+import pandas as pd
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Any, Callable, Dict, List, Optional
 from datetime import datetime, timedelta
 
+from .serialization import json_dumps, to_native
+
+
+# Low-cardinality string columns stored as categoricals so that grouping and
+# de-duplication operate on integer codes. For this dataset that is about half
+# the footprint of dtype_backend='pyarrow' (arrow strings still store every
+# value) and keeps numeric/date columns as the NumPy dtypes downstream expects.
+CATEGORICAL_COLUMNS = [
+    'campaign_name',
+    'adset_name',
+    'audience_type',
+    'creative_type',
+    'creative_message',
+    'platform',
+    'country',
+]
+
+# Analysis sections DataLoader.compute_all can produce, in output order
+ANALYSIS_SECTIONS = [
+    'campaign_performance',
+    'creative_performance',
+    'roas_timeline',
+    'low_ctr_campaigns',
+]
+
+# Aggregations reported in the summary, computed in a single agg call
+SUMMARY_AGGREGATIONS = {
+    'spend': 'sum',
+    'impressions': 'sum',
+    'clicks': 'sum',
+    'purchases': 'sum',
+    'revenue': 'sum',
+    'ctr': 'mean',
+    'roas': ['mean', 'min', 'max'],
+}
+
+
+# Parquet schema-metadata key holding the fingerprint of the settings a
+# cached frame was written with. Bump PARQUET_CACHE_VERSION whenever loading
+# changes in a way the read options do not capture.
+PARQUET_CACHE_VERSION = 1
+_FINGERPRINT_KEY = b'fb_analyst.cache_fingerprint'
+
+
+# Distinct values reported per column before the list is truncated
+MAX_SUMMARY_VALUES = 50
+
+
+def top_k_values(series: pd.Series, k: int = MAX_SUMMARY_VALUES) -> Dict[str, Any]:
+    """
+    Summarize a column's distinct values, most frequent first.
+
+    Bounds the summary (and the prompts it is serialized into) for
+    high-cardinality columns; cardinality reports the full distinct count.
+    """
+    counts = series.value_counts()
+    # Categoricals report unused categories with a zero count
+    counts = counts[counts > 0]
+    return {
+        "values": counts.index[:k].tolist(),
+        "cardinality": len(counts),
+        "truncated": len(counts) > k,
+    }
+
 
 class DataSummary:
     """Summary statistics for dataset analysis."""
 
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: pd.DataFrame, max_values: int = MAX_SUMMARY_VALUES):
         """Initialize with dataframe."""
         self.df = df
+        self.max_values = max_values
         self.generate_summary()
 
     def generate_summary(self):
         """Generate summary statistics."""
+        stats = self.df.agg(SUMMARY_AGGREGATIONS)
+
+        dates = self.df['date']
+        if len(dates) > 0 and dates.is_monotonic_increasing:
+            # DataLoader sorts by date, so the range is just the end points
+            start, end = dates.iloc[0], dates.iloc[-1]
+        else:
+            start, end = dates.min(), dates.max()
+
+        # Store JSON-native values only, so serializing never hits a fallback
         self.summary = {
             "row_count": len(self.df),
             "date_range": {
-                "start": self.df['date'].min(),
-                "end": self.df['date'].max(),
+                "start": start.isoformat(),
+                "end": end.isoformat(),
             },
-            "campaigns": self.df['campaign_name'].unique().tolist(),
-            "adsets": self.df['adset_name'].unique().tolist(),
-            "creative_types": self.df['creative_type'].unique().tolist(),
-            "audience_types": self.df['audience_type'].unique().tolist(),
-            "countries": self.df['country'].unique().tolist(),
+            "campaigns": top_k_values(self.df['campaign_name'], self.max_values),
+            "adsets": top_k_values(self.df['adset_name'], self.max_values),
+            "creative_types": top_k_values(self.df['creative_type'], self.max_values),
+            "audience_types": top_k_values(self.df['audience_type'], self.max_values),
+            "countries": top_k_values(self.df['country'], self.max_values),
             "performance_metrics": {
-                "total_spend": float(self.df['spend'].sum()),
-                "total_impressions": int(self.df['impressions'].sum()),
-                "total_clicks": int(self.df['clicks'].sum()),
-                "total_purchases": int(self.df['purchases'].sum()),
-                "total_revenue": float(self.df['revenue'].sum()),
-                "avg_ctr": float(self.df['ctr'].mean()),
-                "avg_roas": float(self.df['roas'].mean()),
-                "min_roas": float(self.df['roas'].min()),
-                "max_roas": float(self.df['roas'].max()),
+                "total_spend": float(stats.at['sum', 'spend']),
+                "total_impressions": int(stats.at['sum', 'impressions']),
+                "total_clicks": int(stats.at['sum', 'clicks']),
+                "total_purchases": int(stats.at['sum', 'purchases']),
+                "total_revenue": float(stats.at['sum', 'revenue']),
+                "avg_ctr": float(stats.at['mean', 'ctr']),
+                "avg_roas": float(stats.at['mean', 'roas']),
+                "min_roas": float(stats.at['min', 'roas']),
+                "max_roas": float(stats.at['max', 'roas']),
             },
         }
 
@@ -49,70 +126,159 @@ class DataSummary:
 
     def to_json(self) -> str:
         """Return summary as JSON string."""
-        return json.dumps(self.summary, indent=2, default=str)
+        return json_dumps(self.summary)
 
 
 class DataLoader:
     """Load and process Facebook Ads dataset."""
 
-    def __init__(self, dataset_path: str, sample_mode: bool = False, sample_size: int = 100):
+    def __init__(
+        self,
+        dataset_path: str,
+        sample_mode: bool = False,
+        sample_size: int = 100,
+        parquet_cache: bool = True,
+    ):
         """Initialize data loader."""
         self.dataset_path = dataset_path
         self.sample_mode = sample_mode
         self.sample_size = sample_size
+        self.parquet_cache = parquet_cache
         self.df: Optional[pd.DataFrame] = None
+        # Derived views, computed on first use and dropped on every load
+        self._views: Dict[Any, Any] = {}
 
     def load(self) -> pd.DataFrame:
-        """Load dataset from CSV."""
-        if not Path(self.dataset_path).exists():
+        """Load dataset, reading a typed Parquet copy of the CSV when it is fresh."""
+        csv_path = Path(self.dataset_path)
+        if not csv_path.exists():
             raise FileNotFoundError(f"Dataset not found: {self.dataset_path}")
 
-        self.df = pd.read_csv(self.dataset_path)
-        
-        
-        self.df['date'] = pd.to_datetime(self.df['date'])
-        
-        
-        self.df = self.df.sort_values('date').reset_index(drop=True)
-        
-        
-        if self.sample_mode:
-            self.df = self.df.head(self.sample_size)
-        
+        self._views = {}
+
+        cache_path = self._cache_path()
+        if self.parquet_cache and self._cache_is_fresh(cache_path, csv_path):
+            # Stored already typed and sorted by date
+            self.df = pd.read_parquet(cache_path, engine='pyarrow')
+            return self.df
+
+        self.df = self._read_csv()
+        if self.parquet_cache:
+            self._write_cache(cache_path)
+
         return self.df
 
-    def get_summary(self) -> DataSummary:
-        """Get data summary."""
+    def _read_csv(self) -> pd.DataFrame:
+        """Parse the CSV with typed columns and sort it by date."""
+        read_options = self._read_options()
+        if self.sample_mode:
+            # Stop parsing after sample_size rows; the pyarrow engine has no nrows
+            df = pd.read_csv(self.dataset_path, nrows=self.sample_size, **read_options)
+        else:
+            df = pd.read_csv(self.dataset_path, engine='pyarrow', **read_options)
+
+        return df.sort_values('date').reset_index(drop=True)
+
+    @staticmethod
+    def _read_options() -> Dict[str, Any]:
+        """Return the pandas.read_csv options that type the frame."""
+        return {
+            'dtype': {col: 'category' for col in CATEGORICAL_COLUMNS},
+            'parse_dates': ['date'],
+        }
+
+    def _cache_fingerprint(self) -> bytes:
+        """Hash the settings that shape the typed frame stored in the Parquet cache."""
+        settings = {
+            'version': PARQUET_CACHE_VERSION,
+            'read_options': self._read_options(),
+            'sort_by': 'date',
+            'pandas': pd.__version__,
+        }
+        raw = json.dumps(settings, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest().encode()
+
+    def _cache_is_fresh(self, cache_path: Path, csv_path: Path) -> bool:
+        """Return True if the cache is newer than the CSV and written with the current settings."""
+        if not cache_path.exists() or cache_path.stat().st_mtime < csv_path.stat().st_mtime:
+            return False
+        try:
+            import pyarrow.parquet as pq
+            metadata = pq.read_schema(cache_path).metadata or {}
+        except (OSError, ImportError, ValueError):
+            return False
+        return metadata.get(_FINGERPRINT_KEY) == self._cache_fingerprint()
+
+    def _cache_path(self) -> Path:
+        """Return the Parquet cache path for the current load mode."""
+        path = Path(self.dataset_path)
+        if self.sample_mode:
+            return path.with_suffix(f'.sample{self.sample_size}.parquet')
+        return path.with_suffix('.parquet')
+
+    def _write_cache(self, cache_path: Path):
+        """Write the loaded frame to Parquet; a failed write only costs the speedup."""
+        tmp_path = cache_path.with_suffix('.parquet.tmp')
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(self.df, preserve_index=False)
+            metadata = {**(table.schema.metadata or {}), _FINGERPRINT_KEY: self._cache_fingerprint()}
+            pq.write_table(table.replace_schema_metadata(metadata), tmp_path, compression='zstd')
+            os.replace(tmp_path, cache_path)
+        except (OSError, ImportError, ValueError):
+            tmp_path.unlink(missing_ok=True)
+
+    def _view(self, key: Any, compute: Callable[[], Any]) -> Any:
+        """Return a derived view of the loaded frame, computing it on first use."""
         if self.df is None:
             self.load()
-        return DataSummary(self.df)
+        if key not in self._views:
+            self._views[key] = compute()
+        return self._views[key]
+
+    def get_summary(self) -> DataSummary:
+        """Get data summary."""
+        return self._view('summary', lambda: DataSummary(self.df))
 
     def filter_low_ctr(self, threshold: float = 0.012) -> pd.DataFrame:
         """Filter campaigns with CTR below threshold."""
-        if self.df is None:
-            self.load()
-        return self.df[self.df['ctr'] < threshold]
+        return self._view(('low_ctr', threshold), lambda: self.df[self.df['ctr'] < threshold])
 
     def filter_roas_period(self, start_date: str, end_date: str) -> pd.DataFrame:
         """Filter data for specific date range."""
         if self.df is None:
             self.load()
-        
+
         start = pd.to_datetime(start_date)
         end = pd.to_datetime(end_date)
-        return self.df[(self.df['date'] >= start) & (self.df['date'] <= end)]
+        dates = self.df['date']
+        if not dates.is_monotonic_increasing:
+            return self.df[(dates >= start) & (dates <= end)]
+
+        # load() sorts by date, so the range is a binary-searched slice
+        lo = dates.searchsorted(start, side='left')
+        hi = dates.searchsorted(end, side='right')
+        return self.df.iloc[lo:hi]
 
     def get_campaign_performance(self, campaign_name: str) -> pd.DataFrame:
         """Get performance data for specific campaign."""
-        if self.df is None:
-            self.load()
-        return self.df[self.df['campaign_name'] == campaign_name]
+        by_campaign = self._view(
+            'by_campaign',
+            lambda: dict(tuple(self.df.groupby('campaign_name', sort=False, observed=True))),
+        )
+        if campaign_name not in by_campaign:
+            return self.df.iloc[0:0]
+        return by_campaign[campaign_name]
 
     def get_roas_timeline(self) -> List[Dict[str, Any]]:
         """Get ROAS timeline for trend analysis."""
-        if self.df is None:
-            self.load()
-        
+        # Shallow copy so callers can slice or extend without touching the cache
+        return list(self._view('roas_timeline', self._compute_roas_timeline))
+
+    def _compute_roas_timeline(self) -> List[Dict[str, Any]]:
+        """Aggregate spend, revenue and engagement per day."""
         daily_roas = self.df.groupby('date').agg({
             'spend': 'sum',
             'revenue': 'sum',
@@ -125,18 +291,69 @@ class DataLoader:
         
         return daily_roas.to_dict('records')
 
+    def compute_all(
+        self,
+        requirements: Optional[List[str]] = None,
+        low_ctr_threshold: float = 0.012,
+    ) -> Dict[str, Any]:
+        """
+        Compute the requested analysis sections as JSON-native values.
+
+        Each section is one aggregation pass over its grouping key (campaign,
+        creative type, date) or one filter, memoized until the next load.
+        No requirements means every section; unknown names are ignored.
+        """
+        builders = {
+            'campaign_performance': self._campaign_performance_section,
+            'creative_performance': lambda: {'creative_performance': self.get_creative_performance()},
+            'roas_timeline': lambda: {'roas_timeline': self.get_roas_timeline()[:10]},  # Last 10 entries
+            'low_ctr_campaigns': lambda: self._low_ctr_section(low_ctr_threshold),
+        }
+        requested = requirements or ANALYSIS_SECTIONS
+
+        analysis = {}
+        for section in ANALYSIS_SECTIONS:
+            if section in requested:
+                key = ('section', section, low_ctr_threshold if section == 'low_ctr_campaigns' else None)
+                analysis.update(self._view(key, builders[section]))
+        return to_native(analysis)
+
+    def _campaign_performance_section(self) -> Dict[str, Any]:
+        """Aggregate performance by campaign as parallel per-metric lists."""
+        campaign_perf = self.df.groupby('campaign_name', sort=False, observed=True).agg(
+            avg_roas=('roas', 'mean'),
+            avg_ctr=('ctr', 'mean'),
+            total_spend=('spend', 'sum'),
+            record_count=('campaign_name', 'size'),
+        )
+
+        # Columnar layout: one list of names plus one parallel list per metric
+        return {
+            'campaign_performance': {
+                'campaign_names': campaign_perf.index.tolist(),
+                **{metric: campaign_perf[metric].to_numpy() for metric in campaign_perf.columns},
+            },
+        }
+
+    def _low_ctr_section(self, threshold: float) -> Dict[str, Any]:
+        """Count low-CTR rows and list the five lowest distinct ones."""
+        low_ctr = self.filter_low_ctr(threshold=threshold)
+        # Select the lowest-CTR rows before de-duplicating so only a bounded slice is hashed
+        lowest = low_ctr.nsmallest(50, 'ctr')[['campaign_name', 'adset_name', 'ctr', 'creative_message']]
+        return {
+            'low_ctr_count': len(low_ctr),
+            'low_ctr_campaigns': lowest.drop_duplicates().head(5).to_dict('records'),
+        }
+
     def get_creative_performance(self) -> Dict[str, Dict[str, float]]:
         """Analyze performance by creative type."""
-        if self.df is None:
-            self.load()
-        
-        creative_perf = {}
-        for creative_type in self.df['creative_type'].unique():
-            subset = self.df[self.df['creative_type'] == creative_type]
-            creative_perf[creative_type] = {
-                'avg_ctr': float(subset['ctr'].mean()),
-                'avg_roas': float(subset['roas'].mean()),
-                'count': len(subset),
-            }
-        
-        return creative_perf
+        return self._view('creative_performance', self._compute_creative_performance)
+
+    def _compute_creative_performance(self) -> Dict[str, Dict[str, float]]:
+        """Aggregate CTR and ROAS per creative type in one groupby pass."""
+        creative_perf = self.df.groupby('creative_type', sort=False, observed=True).agg(
+            avg_ctr=('ctr', 'mean'),
+            avg_roas=('roas', 'mean'),
+            count=('ctr', 'size'),
+        )
+        return creative_perf.to_dict('index')
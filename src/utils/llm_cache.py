@@ -0,0 +1,131 @@
+"""
+Disk-backed cache for LLM responses.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Non-POSIX platforms: fall back to unlocked writes
+    fcntl = None
+
+
+class LLMCache:
+    """Exact-match response cache keyed by a hash of the request."""
+
+    def __init__(
+        self,
+        cache_dir: str = "logs/llm_cache",
+        ttl_seconds: Optional[float] = None,
+        max_temperature: float = 0.7,
+    ):
+        """Initialize cache directory and hit/miss counters.
+
+        Entries older than ttl_seconds are treated as misses; None keeps
+        them indefinitely. Requests sampled above max_temperature are meant
+        to vary, so they are neither served from nor stored in the cache.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+        self.max_temperature = max_temperature
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        # get() runs on worker threads for async callers
+        self._stats_lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        model_name: str,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        json_only: bool = False,
+    ) -> str:
+        """Build the cache key for a generation request.
+
+        json_only separates JSON-only responses (cut off after the first JSON
+        value) from full-text responses to the same prompt.
+        """
+        raw = f"{model_name}|{temperature}|{max_tokens}|{int(json_only)}|{prompt}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None on a miss."""
+        try:
+            with open(self._path(key), 'r') as f:
+                entry = json.load(f)
+            response = entry["response"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            self._count(hit=False)
+            return None
+
+        if self._expired(entry):
+            # Drop stale entries so the directory does not grow without bound
+            self._path(key).unlink(missing_ok=True)
+            self._count(hit=False)
+            return None
+
+        self._count(hit=True)
+        return response
+
+    def put(self, key: str, response: str):
+        """Store a response atomically."""
+        with self._lock():
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump({"response": response, "created_at": time.time()}, f)
+                os.replace(tmp_path, self._path(key))
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters for this process."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _count(self, hit: bool):
+        """Record a lookup in the hit/miss counters."""
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _expired(self, entry: Dict) -> bool:
+        """Return True if a cache entry is older than the configured TTL."""
+        if self.ttl_seconds is None:
+            return False
+        # Entries written before TTLs were recorded count as expired
+        return time.time() - entry.get("created_at", 0) > self.ttl_seconds
+
+    def _path(self, key: str) -> Path:
+        """Return the file path for a cache key."""
+        return self.cache_dir / f"{key}.json"
+
+    @contextmanager
+    def _lock(self):
+        """Hold an exclusive lock on the cache directory while writing."""
+        if fcntl is None:
+            yield
+            return
+
+        with open(self.cache_dir / ".lock", 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
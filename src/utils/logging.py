@@ -3,20 +3,116 @@ Logging utilities for the Agentic Facebook Analyst system.
 Provides structured JSON logging and optional Langfuse integration.
 """
 
+import atexit
 import json
 import logging
+import logging.handlers
 import os
+import queue
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import sys
 
 
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Enqueue records unformatted so timestamp formatting runs on the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _JSONEntryFormatter(logging.Formatter):
+    """Prefix a pre-serialized JSON log entry with its ISO timestamp."""
+
+    def __init__(self, prefix: str = ""):
+        super().__init__()
+        self.prefix = prefix
+
+    def format(self, record: logging.LogRecord) -> str:
+        # Both listener handlers format the same record; stamp it once
+        line = getattr(record, "json_line", None)
+        if line is None:
+            line = record.getMessage()
+            ts_ns = getattr(record, "ts_ns", None)
+            if ts_ns is not None:
+                timestamp = datetime.fromtimestamp(ts_ns / 1e9).isoformat()
+                line = f'{{"timestamp": "{timestamp}", {line[1:]}'
+            record.json_line = line
+        return self.prefix % {"levelname": record.levelname} + line
+
+
+class _BatchedAppendHandler(logging.Handler):
+    """
+    Append formatted records to a file in batches.
+
+    The file is opened once with O_APPEND; buffered lines are written with a
+    single os.write when the batch fills, on an error record, or on close.
+    """
+
+    def __init__(self, path: str, capacity: int = 50, flush_level: int = logging.ERROR):
+        super().__init__()
+        self.capacity = capacity
+        self.flush_level = flush_level
+        self._buffer: List[str] = []
+        self._fd: Optional[int] = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self._buffer.append(self.format(record) + "\n")
+            if len(self._buffer) >= self.capacity or record.levelno >= self.flush_level:
+                self._write_buffer()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        self.acquire()
+        try:
+            self._write_buffer()
+        finally:
+            self.release()
+
+    def close(self):
+        self.acquire()
+        try:
+            self._write_buffer()
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+        finally:
+            self.release()
+        super().close()
+
+    def _write_buffer(self):
+        """Write all buffered lines; caller holds the handler lock."""
+        if not self._buffer or self._fd is None:
+            return
+        data = "".join(self._buffer).encode("utf-8")
+        self._buffer.clear()
+        while data:
+            written = os.write(self._fd, data)
+            data = data[written:]
+
+
 class StructuredLogger:
     """Structured JSON logger for agent operations."""
 
-    def __init__(self, name: str, log_dir: str = "logs", enable_langfuse: bool = False):
-        """Initialize structured logger."""
+    def __init__(
+        self,
+        name: str,
+        log_dir: str = "logs",
+        enable_langfuse: bool = False,
+        flush_every: int = 50,
+    ):
+        """
+        Initialize structured logger.
+
+        Records are handed to a background listener thread, which writes them
+        to the console and, in batches of flush_every, to the JSONL file.
+        Errors and close() flush the batch immediately.
+        """
         self.name = name
         self.log_dir = log_dir
         self.enable_langfuse = enable_langfuse
@@ -30,14 +126,22 @@ class StructuredLogger:
         self.logger.setLevel(logging.INFO)
         
        
-        file_handler = logging.FileHandler(self.log_file)
-        file_handler.setFormatter(logging.Formatter('%(message)s'))
-        self.logger.addHandler(file_handler)
-        
-       
+        self._file_handler = _BatchedAppendHandler(self.log_file, capacity=flush_every)
+        self._file_handler.setFormatter(_JSONEntryFormatter())
+
         console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setFormatter(logging.Formatter('[%(levelname)s] %(message)s'))
-        self.logger.addHandler(console_handler)
+        console_handler.setFormatter(_JSONEntryFormatter('[%(levelname)s] '))
+
+        # Callers serialize their entry and enqueue it; timestamp formatting
+        # and I/O happen on the listener thread
+        log_queue: queue.Queue = queue.Queue(-1)
+        self._queue_handler = _DeferredQueueHandler(log_queue)
+        self.logger.addHandler(self._queue_handler)
+        self._listener = logging.handlers.QueueListener(
+            log_queue, self._file_handler, console_handler, respect_handler_level=True
+        )
+        self._listener.start()
+        atexit.register(self.close)
         
         
         self.langfuse_client = None
@@ -48,35 +152,42 @@ class StructuredLogger:
             except ImportError:
                 print("Warning: Langfuse not available. Structured logging only.")
 
+    def _log(self, level: int, entry: Dict[str, Any]):
+        """Serialize an entry on the caller's thread and enqueue it."""
+        # Serializing here snapshots caller-owned values such as context, so
+        # later mutation cannot change or break the logged line
+        ts_ns = entry.pop("ts_ns")
+        self.logger.log(level, json.dumps(entry, default=str), extra={"ts_ns": ts_ns})
+
     def log_agent_start(self, agent_name: str, task: str, context: Dict[str, Any]) -> str:
         """Log agent execution start."""
-        trace_id = f"{agent_name}_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+        trace_id = f"{agent_name}_{time.time_ns()}"
         log_entry = {
-            "timestamp": datetime.now().isoformat(),
+            "ts_ns": time.time_ns(),
             "event": "agent_start",
             "agent": agent_name,
             "task": task,
             "trace_id": trace_id,
             "context": context,
         }
-        self.logger.info(json.dumps(log_entry))
+        self._log(logging.INFO, log_entry)
         return trace_id
 
     def log_agent_thought(self, agent_name: str, trace_id: str, thought: str):
         """Log agent reasoning step."""
         log_entry = {
-            "timestamp": datetime.now().isoformat(),
+            "ts_ns": time.time_ns(),
             "event": "agent_thought",
             "agent": agent_name,
             "trace_id": trace_id,
             "thought": thought,
         }
-        self.logger.info(json.dumps(log_entry))
+        self._log(logging.INFO, log_entry)
 
     def log_agent_action(self, agent_name: str, trace_id: str, action: str, input_data: Any, output: Any):
         """Log agent action."""
         log_entry = {
-            "timestamp": datetime.now().isoformat(),
+            "ts_ns": time.time_ns(),
             "event": "agent_action",
             "agent": agent_name,
             "trace_id": trace_id,
@@ -84,52 +195,75 @@ class StructuredLogger:
             "input": str(input_data)[:500], 
             "output": str(output)[:500],
         }
-        self.logger.info(json.dumps(log_entry))
+        self._log(logging.INFO, log_entry)
 
     def log_agent_result(self, agent_name: str, trace_id: str, result: Any, confidence: Optional[float] = None):
         """Log agent result."""
         log_entry = {
-            "timestamp": datetime.now().isoformat(),
+            "ts_ns": time.time_ns(),
             "event": "agent_result",
             "agent": agent_name,
             "trace_id": trace_id,
             "result_summary": str(result)[:1000],
             "confidence": confidence,
         }
-        self.logger.info(json.dumps(log_entry))
+        self._log(logging.INFO, log_entry)
 
     def log_error(self, agent_name: str, trace_id: str, error: str):
         """Log agent error."""
         log_entry = {
-            "timestamp": datetime.now().isoformat(),
+            "ts_ns": time.time_ns(),
             "event": "agent_error",
             "agent": agent_name,
             "trace_id": trace_id,
             "error": error,
         }
-        self.logger.error(json.dumps(log_entry))
+        self._log(logging.ERROR, log_entry)
 
     def log_metrics(self, metrics: Dict[str, Any]):
         """Log system metrics."""
         log_entry = {
-            "timestamp": datetime.now().isoformat(),
+            "ts_ns": time.time_ns(),
             "event": "metrics",
             "metrics": metrics,
         }
-        self.logger.info(json.dumps(log_entry))
+        self._log(logging.INFO, log_entry)
 
     def get_log_file(self) -> str:
         """Return path to current log file."""
         return self.log_file
 
+    def close(self):
+        """Detach from the logging.Logger, drain queued records and flush them to disk."""
+        if self._listener is None:
+            return
+        self.logger.removeHandler(self._queue_handler)
+        self._listener.stop()
+        self._listener = None
+        self._file_handler.close()
+        atexit.unregister(self.close)
 
 
-_logger_instance: Optional[StructuredLogger] = None
+
+_loggers: Dict[Tuple[str, str], StructuredLogger] = {}
+_loggers_lock = threading.Lock()
 
 
 def get_logger(name: str = "agentic_analyst", log_dir: str = "logs") -> StructuredLogger:
-    """Get or create global logger instance."""
-    global _logger_instance
-    if _logger_instance is None:
-        _logger_instance = StructuredLogger(name, log_dir)
-    return _logger_instance
+    """Get or create the shared logger instance for (name, log_dir)."""
+    # Creating under the lock keeps concurrent first calls from attaching
+    # two sets of handlers to the same logging.Logger
+    with _loggers_lock:
+        logger = _loggers.get((name, log_dir))
+        if logger is None:
+            logger = _loggers[(name, log_dir)] = StructuredLogger(name, log_dir)
+        return logger
+
+
+def reset_loggers():
+    """Close and drop the shared loggers so the next get_logger() starts a new file."""
+    with _loggers_lock:
+        loggers = list(_loggers.values())
+        _loggers.clear()
+    for logger in loggers:
+        logger.close()
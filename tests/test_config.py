@@ -0,0 +1,68 @@
+"""
+Tests for loading, reloading and sharing Config instances.
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.utils.config import Config, get_config, reset_config
+
+
+class ConfigReloadTest(unittest.TestCase):
+    """Config re-reads its YAML file only when the file changes."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "config.yaml"
+        self.mtime = 1_000_000.0
+        self.write("model:\n  name: first\n")
+
+    def tearDown(self):
+        reset_config()
+        self.tmp.cleanup()
+
+    def write(self, text: str):
+        """Write the config file with a later mtime than the previous write."""
+        self.path.write_text(text)
+        self.mtime += 1
+        os.utime(self.path, (self.mtime, self.mtime))
+
+    def test_unchanged_file_is_not_reloaded(self):
+        config = Config(str(self.path))
+
+        self.assertFalse(config.reload_if_changed())
+        self.assertEqual(config.get("model.name"), "first")
+
+    def test_modified_file_is_reloaded(self):
+        config = Config(str(self.path))
+        self.write("model:\n  name: second\n")
+
+        self.assertTrue(config.reload_if_changed())
+        self.assertEqual(config.get("model.name"), "second")
+        self.assertEqual(config.get_dict("model"), {"name": "second"})
+
+    def test_missing_file_keeps_last_config(self):
+        config = Config(str(self.path))
+        self.path.unlink()
+
+        self.assertFalse(config.reload_if_changed())
+        self.assertEqual(config.get("model.name"), "first")
+
+    def test_get_config_shares_and_refreshes_instance(self):
+        config = get_config(str(self.path))
+        self.write("model:\n  name: second\n")
+
+        self.assertIs(get_config(str(self.path)), config)
+        self.assertEqual(config.get("model.name"), "second")
+
+    def test_reset_config_drops_shared_instance(self):
+        config = get_config(str(self.path))
+        reset_config()
+
+        self.assertIsNot(get_config(str(self.path)), config)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Tests for dataset loading and summary utilities.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.utils import data
+from src.utils.data import DataLoader, DataSummary
+
+
+DATASET_PATH = Path(__file__).resolve().parents[1] / "data" / "synthetic_fb_ads_undergarments.csv"
+
+
+class DataSummaryTest(unittest.TestCase):
+    """DataSummary reports the date range and totals of a frame."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.df = DataLoader(str(DATASET_PATH), parquet_cache=False).load()
+
+    def test_date_range_of_sorted_frame(self):
+        summary = DataSummary(self.df).to_dict()
+
+        self.assertEqual(summary["date_range"]["start"], self.df["date"].min().isoformat())
+        self.assertEqual(summary["date_range"]["end"], self.df["date"].max().isoformat())
+
+    def test_empty_frame(self):
+        summary = DataSummary(self.df.iloc[:0]).to_dict()
+
+        self.assertEqual(summary["row_count"], 0)
+        self.assertEqual(summary["date_range"], {"start": "NaT", "end": "NaT"})
+
+
+class DataLoaderParquetCacheTest(unittest.TestCase):
+    """DataLoader serves its typed Parquet copy only while it is fresh."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.dataset_path = os.path.join(self.tmp_dir, "ads.csv")
+        shutil.copy(DATASET_PATH, self.dataset_path)
+        self.expected = DataLoader(self.dataset_path).load()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _load_counting_csv_reads(self):
+        loader = DataLoader(self.dataset_path)
+        with mock.patch.object(DataLoader, "_read_csv", autospec=True, side_effect=DataLoader._read_csv) as read_csv:
+            df = loader.load()
+        return df, read_csv.call_count
+
+    def test_fresh_cache_is_reused(self):
+        df, csv_reads = self._load_counting_csv_reads()
+
+        self.assertEqual(csv_reads, 0)
+        self.assertTrue(df.equals(self.expected))
+        self.assertTrue((df.dtypes == self.expected.dtypes).all())
+
+    def test_cache_written_with_other_settings_is_ignored(self):
+        with mock.patch.object(data, "PARQUET_CACHE_VERSION", data.PARQUET_CACHE_VERSION + 1):
+            df, csv_reads = self._load_counting_csv_reads()
+
+        self.assertEqual(csv_reads, 1)
+        self.assertTrue(df.equals(self.expected))
+
+    def test_cache_older_than_csv_is_ignored(self):
+        stat = os.stat(self.dataset_path)
+        os.utime(self.dataset_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        _, csv_reads = self._load_counting_csv_reads()
+
+        self.assertEqual(csv_reads, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Tests for DataAgent data loading and analysis.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.agents.data_agent import DataAgent
+
+
+DATASET_PATH = Path(__file__).resolve().parents[1] / "data" / "synthetic_fb_ads_undergarments.csv"
+
+
+class DataAgentAnalysisTest(unittest.TestCase):
+    """DataAgent runs the requested analyses on a loaded frame."""
+
+    def setUp(self):
+        # Work on a copy so the Parquet cache and mtime changes stay local
+        self.tmp_dir = tempfile.mkdtemp()
+        self.dataset_path = os.path.join(self.tmp_dir, "ads.csv")
+        shutil.copy(DATASET_PATH, self.dataset_path)
+        self.agent = DataAgent("DataAgent", llm_client=None)
+        self.context = {
+            "dataset_path": self.dataset_path,
+            "sample_mode": True,
+            "sample_size": 100,
+            "analysis_requirements": ["campaign_performance", "creative_performance"],
+            "defer_structuring": True,
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_analysis_is_not_empty_for_loaded_frame(self):
+        result = self.agent.execute("Analyze performance", self.context)
+
+        self.assertEqual(result["status"], "success")
+        self.assertIsNotNone(self.agent.df)
+        self.assertTrue(result["analysis"])
+        self.assertTrue(result["analysis"]["campaign_performance"])
+        self.assertTrue(result["analysis"]["creative_performance"])
+
+    def test_edited_dataset_is_reloaded(self):
+        self.agent.execute("Analyze performance", self.context)
+        first_loader = self.agent.data_loader
+
+        stat = os.stat(self.dataset_path)
+        os.utime(self.dataset_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.agent.execute("Analyze performance", self.context)
+
+        self.assertIsNot(self.agent.data_loader, first_loader)
+
+    def test_unchanged_dataset_reuses_loader(self):
+        self.agent.execute("Analyze performance", self.context)
+        first_loader = self.agent.data_loader
+
+        self.agent.execute("Analyze performance", self.context)
+
+        self.assertIs(self.agent.data_loader, first_loader)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Tests for the agents' fallback results used when an LLM call fails.
+"""
+
+import unittest
+
+from src.agents.creative_generator import _FALLBACK_CREATIVE, CreativeGeneratorAgent
+from src.agents.evaluator import _FALLBACK_EVALUATION, _FALLBACK_HYPOTHESIS_EVALUATION, EvaluatorAgent
+from src.agents.insight_agent import _FALLBACK_HYPOTHESES, InsightAgent
+
+
+class FallbackTest(unittest.TestCase):
+    """Fallbacks match their templates and never share containers with them."""
+
+    def test_creative_fallback_is_independent_of_template(self):
+        agent = CreativeGeneratorAgent("CreativeGenerator", llm_client=None)
+        campaign = {"campaign_name": "Men Premium Modal", "ctr": 0.004, "creative_message": "Soft"}
+
+        fallback = agent._create_fallback_creative(campaign)
+        self.assertEqual(fallback["creative_recommendations"], _FALLBACK_CREATIVE["creative_recommendations"])
+        self.assertEqual(fallback["low_performer_analysis"]["campaign_name"], "Men Premium Modal")
+
+        fallback["creative_recommendations"][0]["headline"] = "changed"
+        fallback["implementation_priority"].clear()
+        fallback["low_performer_analysis"]["performance_gap"] = "changed"
+
+        fresh = agent._create_fallback_creative(campaign)
+        self.assertNotEqual(fresh["creative_recommendations"][0]["headline"], "changed")
+        self.assertEqual(fresh["implementation_priority"], _FALLBACK_CREATIVE["implementation_priority"])
+        self.assertEqual(fresh["low_performer_analysis"]["performance_gap"], "Below average CTR")
+
+    def test_hypotheses_fallback_is_independent_of_template(self):
+        agent = InsightAgent("InsightAgent", llm_client=None)
+
+        fallback = agent._create_fallback_hypotheses("Why did ROAS drop?", {})
+        self.assertEqual(fallback["query_summary"], "Why did ROAS drop?")
+        self.assertEqual(fallback["hypotheses"], _FALLBACK_HYPOTHESES["hypotheses"])
+
+        fallback["hypotheses"][0]["supporting_evidence"].append("changed")
+        fallback["hypotheses"].pop()
+        fallback["priority_ranking"][0]["priority_score"] = 0
+
+        fresh = agent._create_fallback_hypotheses("Why did ROAS drop?", {})
+        self.assertEqual(fresh["hypotheses"], _FALLBACK_HYPOTHESES["hypotheses"])
+        self.assertEqual(fresh["priority_ranking"], _FALLBACK_HYPOTHESES["priority_ranking"])
+
+    def test_evaluation_fallback_is_independent_of_template(self):
+        agent = EvaluatorAgent("Evaluator", llm_client=None)
+        hypotheses = [{"id": "h1", "title": "Audience Fatigue", "confidence": 0.75}]
+
+        fallback = agent._create_fallback_evaluation(hypotheses)
+        evaluation = fallback["hypothesis_evaluations"][0]
+        self.assertEqual(evaluation["hypothesis_title"], "Audience Fatigue")
+        self.assertEqual(evaluation["data_evidence"], _FALLBACK_HYPOTHESIS_EVALUATION["data_evidence"])
+
+        evaluation["data_evidence"]["primary_metric"]["baseline"] = 0
+        evaluation["supporting_metrics"].clear()
+        fallback["recommended_actions"].append("changed")
+        fallback["top_validated_insights"][0]["confidence"] = 0
+
+        fresh = agent._create_fallback_evaluation(hypotheses)
+        fresh_evaluation = fresh["hypothesis_evaluations"][0]
+        self.assertEqual(fresh_evaluation["data_evidence"], _FALLBACK_HYPOTHESIS_EVALUATION["data_evidence"])
+        self.assertEqual(fresh_evaluation["supporting_metrics"], _FALLBACK_HYPOTHESIS_EVALUATION["supporting_metrics"])
+        self.assertEqual(fresh["recommended_actions"], _FALLBACK_EVALUATION["recommended_actions"])
+        self.assertEqual(fresh["top_validated_insights"], _FALLBACK_EVALUATION["top_validated_insights"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Tests for detecting the first JSON value in a streamed LLM response.
+"""
+
+import unittest
+
+from src.agents.base import LLMClient, _JSONStreamScanner
+
+
+def scan(text: str, chunk_size: int):
+    """Feed text to a scanner in fixed-size chunks; return the value or None."""
+    scanner = _JSONStreamScanner()
+    for start in range(0, len(text), chunk_size):
+        if scanner.feed(text[start:start + chunk_size]):
+            return scanner.result
+    return None
+
+
+class JSONStreamScannerTest(unittest.TestCase):
+    """The scanner stops at a complete, parseable JSON value and nothing else."""
+
+    CHUNK_SIZES = (1, 3, 7, 1000)
+
+    def assertScans(self, text: str, expected):
+        for chunk_size in self.CHUNK_SIZES:
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(scan(text, chunk_size), expected)
+
+    def test_bare_object(self):
+        self.assertScans('{"subtasks": [1, 2]} trailing prose', '{"subtasks": [1, 2]}')
+
+    def test_fenced_object(self):
+        text = 'Here is the plan:\n```json\n{"subtasks": []}\n```\nDone.'
+        self.assertScans(text, '{"subtasks": []}')
+
+    def test_object_on_fence_line(self):
+        self.assertScans('```json {"a": 1}```', '{"a": 1}')
+
+    def test_brackets_in_prose_before_object(self):
+        text = 'Plan [v1] below:\n```json\n{"subtasks": []}\n```'
+        self.assertScans(text, '{"subtasks": []}')
+
+    def test_unparseable_bracket_at_line_start_is_skipped(self):
+        self.assertScans('[v1] is the plan\n{"a": 1}', '{"a": 1}')
+
+    def test_inline_object_after_prose_is_left_to_full_parse(self):
+        text = 'Here it is: {"a": 1}'
+        self.assertScans(text, None)
+        self.assertEqual(LLMClient._parse_json(text), {"a": 1})
+
+    def test_strings_containing_braces(self):
+        text = '{"headline": "Save {now} ]!", "tags": ["[x]"]}\nmore'
+        self.assertScans(text, '{"headline": "Save {now} ]!", "tags": ["[x]"]}')
+
+    def test_escaped_quotes_and_backslashes(self):
+        text = '{"a": "say \\"}\\" here", "b": "c:\\\\"}\n'
+        self.assertScans(text, '{"a": "say \\"}\\" here", "b": "c:\\\\"}')
+
+    def test_top_level_array(self):
+        self.assertScans('  [{"id": 1}, {"id": 2}]\n', '[{"id": 1}, {"id": 2}]')
+
+    def test_incomplete_object_is_not_complete(self):
+        self.assertScans('{"subtasks": [', None)
+
+
+if __name__ == "__main__":
+    unittest.main()
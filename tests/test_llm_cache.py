@@ -0,0 +1,145 @@
+"""
+Tests for the disk-backed LLM response cache.
+"""
+
+import json
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+from src.agents import base
+from src.agents.base import LLMClient, run_sync
+from src.utils.llm_cache import LLMCache
+
+
+class FakeModel:
+    """Stand-in for genai.GenerativeModel that streams a fixed response."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.calls = 0
+
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        self.calls += 1
+        return [SimpleNamespace(text=self.text)]
+
+    async def generate_content_async(self, prompt, generation_config=None, stream=False):
+        self.calls += 1
+
+        async def chunks():
+            yield SimpleNamespace(text=self.text)
+
+        return chunks()
+
+
+class LLMCacheTest(unittest.TestCase):
+    """Entries are stored atomically and expire after the TTL."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        cache = LLMCache(self.cache_dir)
+        cache.put("k", '{"a": 1}')
+
+        self.assertEqual(cache.get("k"), '{"a": 1}')
+        self.assertIsNone(cache.get("missing"))
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1})
+
+    def test_expired_entry_is_a_miss_and_deleted(self):
+        cache = LLMCache(self.cache_dir, ttl_seconds=60)
+        cache.put("k", "old")
+        path = cache._path("k")
+        entry = json.loads(path.read_text())
+        entry["created_at"] = time.time() - 120
+        path.write_text(json.dumps(entry))
+
+        self.assertIsNone(cache.get("k"))
+        self.assertFalse(path.exists())
+        self.assertEqual(cache.stats(), {"hits": 0, "misses": 1})
+
+    def test_fresh_entry_within_ttl_is_kept(self):
+        cache = LLMCache(self.cache_dir, ttl_seconds=60)
+        cache.put("k", "new")
+
+        self.assertEqual(cache.get("k"), "new")
+        self.assertTrue(cache._path("k").exists())
+
+    def test_concurrent_writes_leave_valid_entries(self):
+        cache = LLMCache(self.cache_dir)
+
+        def write(worker: int):
+            for i in range(20):
+                cache.put("shared", json.dumps({"worker": worker, "i": i}))
+                cache.put(f"own-{worker}", str(i))
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertIn("worker", json.loads(cache.get("shared")))
+        for n in range(8):
+            self.assertEqual(cache.get(f"own-{n}"), "19")
+        self.assertEqual(list(self.cache_dir.glob("*.tmp")), [])
+
+
+class LLMClientCacheTest(unittest.TestCase):
+    """LLMClient only caches low-temperature requests, sync and async alike."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = LLMCache(self.tmp.name, max_temperature=0.5)
+        base._configured_api_key = None
+        self.client = LLMClient(api_key="test-key")
+        self.client.model = FakeModel('{"ok": true}')
+
+    def tearDown(self):
+        base._configured_api_key = None
+        self.tmp.cleanup()
+
+    def test_should_cache_respects_max_temperature(self):
+        self.assertTrue(LLMClient._should_cache(self.cache, True, None, 0.5))
+        self.assertFalse(LLMClient._should_cache(self.cache, True, None, 0.9))
+        self.assertFalse(LLMClient._should_cache(self.cache, False, None, 0.2))
+        self.assertFalse(LLMClient._should_cache(None, True, None, 0.2))
+
+    def test_low_temperature_requests_are_served_from_cache(self):
+        for _ in range(2):
+            result = self.client.generate_json("prompt", temperature=0.2, cache=self.cache)
+
+        self.assertEqual(result, {"ok": True})
+        self.assertEqual(self.client.model.calls, 1)
+        self.assertEqual(self.cache.stats(), {"hits": 1, "misses": 1})
+
+    def test_high_temperature_requests_bypass_cache(self):
+        for _ in range(2):
+            self.client.generate_json("prompt", temperature=0.9, cache=self.cache)
+
+        self.assertEqual(self.client.model.calls, 2)
+        self.assertEqual(self.cache.stats(), {"hits": 0, "misses": 0})
+        self.assertEqual(list(Path(self.tmp.name).glob("*.json")), [])
+
+    def test_async_requests_share_the_cache(self):
+        async def run():
+            first = await self.client.agenerate_json("prompt", temperature=0.2, cache=self.cache)
+            second = await self.client.agenerate_json("prompt", temperature=0.2, cache=self.cache)
+            return first, second
+
+        first, second = run_sync(run())
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.client.model.calls, 1)
+        self.assertEqual(self.cache.stats(), {"hits": 1, "misses": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+"""
+Tests for LLMClient setup of the Gemini SDK.
+"""
+
+import unittest
+
+from google.generativeai import client as genai_client
+
+from src.agents import base
+from src.agents.base import LLMClient
+
+
+class LLMClientTransportTest(unittest.TestCase):
+    """The SDK clients shared by every agent use transports that match their API."""
+
+    def setUp(self):
+        # Force genai.configure to run for this test's key
+        base._configured_api_key = None
+        LLMClient(api_key="test-key")
+
+    def tearDown(self):
+        base._configured_api_key = None
+
+    def test_async_client_uses_asyncio_transport(self):
+        async_client = genai_client.get_default_generative_async_client()
+
+        transport = type(async_client._client._transport).__name__
+        self.assertEqual(transport, "GenerativeServiceGrpcAsyncIOTransport")
+
+    def test_sync_client_uses_grpc_transport(self):
+        sync_client = genai_client.get_default_generative_client()
+
+        transport = type(sync_client._transport).__name__
+        self.assertEqual(transport, "GenerativeServiceGrpcTransport")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+"""
+Tests for sharing and closing StructuredLogger instances.
+"""
+
+import json
+import logging
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.utils.logging import get_logger, reset_loggers
+
+
+class SharedLoggerTest(unittest.TestCase):
+    """get_logger keys shared loggers by (name, log_dir); reset_loggers closes them."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log_dir = str(Path(self.tmp.name) / "a")
+        self.other_dir = str(Path(self.tmp.name) / "b")
+
+    def tearDown(self):
+        reset_loggers()
+        self.tmp.cleanup()
+
+    def test_same_name_and_dir_share_a_logger(self):
+        self.assertIs(get_logger("test_shared", self.log_dir), get_logger("test_shared", self.log_dir))
+
+    def test_loggers_are_keyed_by_name_and_dir(self):
+        logger = get_logger("test_keyed", self.log_dir)
+
+        self.assertIsNot(get_logger("test_keyed", self.other_dir), logger)
+        self.assertIsNot(get_logger("test_keyed_other", self.log_dir), logger)
+        self.assertTrue(get_logger("test_keyed", self.other_dir).get_log_file().startswith(self.other_dir))
+
+    def test_reset_loggers_flushes_and_detaches(self):
+        logger = get_logger("test_reset", self.log_dir)
+        logger.log_metrics({"rows": 3})
+        reset_loggers()
+
+        with open(logger.get_log_file()) as f:
+            entry = json.loads(f.readline())
+        self.assertEqual(entry["metrics"], {"rows": 3})
+        self.assertIn("timestamp", entry)
+        self.assertIsNot(get_logger("test_reset", self.log_dir), logger)
+        self.assertEqual(len(logging.getLogger("test_reset").handlers), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()